@@ -0,0 +1,32 @@
+"""Indices compuestos para los listados de clientes
+
+Revision ID: 2d8b6f0e5a17
+Revises: 9e41d7c2b6a8
+Create Date: 2026-10-17 14:05:51.227840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8b6f0e5a17'
+down_revision: Union[str, None] = '9e41d7c2b6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Paginación por cursor filtrada por tipo: igualdad + rango sobre el mismo índice
+    op.create_index('ix_clientes_tipo_cliente_id', 'clientes', ['tipo_cliente', 'id'], unique=False)
+    # Filtro por prefijo de nombre (LIKE 'texto%')
+    op.create_index('ix_clientes_nombre', 'clientes', ['nombre'], unique=False)
+    op.create_index('ix_clientes_created_at', 'clientes', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_clientes_created_at', table_name='clientes')
+    op.drop_index('ix_clientes_nombre', table_name='clientes')
+    op.drop_index('ix_clientes_tipo_cliente_id', table_name='clientes')
@@ -0,0 +1,33 @@
+"""Indice FULLTEXT para busqueda de clientes
+
+Revision ID: 4f2a9c1d7e31
+Revises: bb3cbd793403
+Create Date: 2026-10-17 09:15:42.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c1d7e31'
+down_revision: Union[str, None] = 'bb3cbd793403'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Búsqueda por nombre y apellido sin ILIKE con comodín inicial
+    op.create_index(
+        'ix_clientes_nombre_apellido_ft',
+        'clientes',
+        ['nombre', 'apellido'],
+        unique=False,
+        mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_clientes_nombre_apellido_ft', table_name='clientes')
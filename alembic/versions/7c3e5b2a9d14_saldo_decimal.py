@@ -0,0 +1,40 @@
+"""Saldo como DECIMAL(18, 2)
+
+Revision ID: 7c3e5b2a9d14
+Revises: 4f2a9c1d7e31
+Create Date: 2026-10-17 11:02:37.514930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5b2a9d14'
+down_revision: Union[str, None] = '4f2a9c1d7e31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Redondear a céntimos antes del cambio de tipo: el valor convertido es explícito
+    op.execute("UPDATE clientes SET saldo = ROUND(saldo, 2) WHERE saldo IS NOT NULL")
+    op.alter_column(
+        'clientes',
+        'saldo',
+        existing_type=sa.Float(),
+        type_=sa.Numeric(18, 2),
+        existing_nullable=True
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'clientes',
+        'saldo',
+        existing_type=sa.Numeric(18, 2),
+        type_=sa.Float(),
+        existing_nullable=True
+    )
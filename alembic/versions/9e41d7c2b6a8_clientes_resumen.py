@@ -0,0 +1,59 @@
+"""Tabla clientes_resumen para estadisticas de saldos
+
+Revision ID: 9e41d7c2b6a8
+Revises: 7c3e5b2a9d14
+Create Date: 2026-10-17 12:40:18.902316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e41d7c2b6a8'
+down_revision: Union[str, None] = '7c3e5b2a9d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    resumen = op.create_table(
+        'clientes_resumen',
+        sa.Column('tipo_cliente', sa.String(length=20), nullable=False),
+        sa.Column('nacionalidad', sa.String(length=50), nullable=False),
+        sa.Column('genero', sa.String(length=20), nullable=False),
+        sa.Column('anio_nacimiento', sa.Integer(), nullable=False),
+        sa.Column('clientes', sa.BigInteger(), nullable=False),
+        sa.Column('saldo_total', sa.Numeric(24, 2), nullable=False),
+        sa.PrimaryKeyConstraint('tipo_cliente', 'nacionalidad', 'genero', 'anio_nacimiento')
+    )
+
+    # Carga inicial desde los clientes existentes. Las columnas Enum guardan el
+    # nombre del miembro (INDIVIDUAL); el resumen guarda su valor (individual)
+    clientes = sa.table(
+        'clientes',
+        sa.column('tipo_cliente', sa.String),
+        sa.column('nacionalidad', sa.String),
+        sa.column('genero', sa.String),
+        sa.column('fecha_nacimiento', sa.Date),
+        sa.column('saldo', sa.Numeric(18, 2)),
+    )
+    tipo = sa.func.coalesce(sa.func.lower(clientes.c.tipo_cliente), '')
+    nacionalidad = sa.func.coalesce(clientes.c.nacionalidad, '')
+    genero = sa.func.coalesce(sa.func.lower(clientes.c.genero), '')
+    anio = sa.extract('year', clientes.c.fecha_nacimiento)
+    op.execute(
+        resumen.insert().from_select(
+            ['tipo_cliente', 'nacionalidad', 'genero', 'anio_nacimiento', 'clientes', 'saldo_total'],
+            sa.select(
+                tipo, nacionalidad, genero, anio,
+                sa.func.count(), sa.func.coalesce(sa.func.sum(clientes.c.saldo), 0)
+            ).group_by(tipo, nacionalidad, genero, anio)
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('clientes_resumen')
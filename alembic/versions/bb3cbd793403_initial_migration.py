@@ -20,11 +20,58 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.create_table(
+        'clientes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('apellido', sa.String(length=100), nullable=False),
+        sa.Column('numero_cuenta', sa.String(length=20), nullable=False),
+        sa.Column('saldo', sa.Float(), nullable=True),
+        sa.Column('fecha_nacimiento', sa.Date(), nullable=False),
+        sa.Column('direccion', sa.String(length=255), nullable=True),
+        sa.Column('telefono', sa.String(length=20), nullable=True),
+        sa.Column('correo_electronico', sa.String(length=100), nullable=True),
+        sa.Column('tipo_cliente', sa.Enum('INDIVIDUAL', 'CORPORATIVO', 'VIP', name='tipoclienteenum'), nullable=True),
+        sa.Column('estado_civil', sa.Enum('SOLTERO', 'CASADO', 'DIVORCIADO', 'VIUDO', name='estadocivilenum'), nullable=True),
+        sa.Column('numero_identificacion', sa.String(length=20), nullable=True),
+        sa.Column('profesion', sa.String(length=100), nullable=True),
+        sa.Column('genero', sa.Enum('MASCULINO', 'FEMENINO', 'OTRO', name='generoenum'), nullable=True),
+        sa.Column('nacionalidad', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_clientes_correo_electronico'), 'clientes', ['correo_electronico'], unique=True)
+    op.create_index(op.f('ix_clientes_id'), 'clientes', ['id'], unique=False)
+    op.create_index(op.f('ix_clientes_numero_cuenta'), 'clientes', ['numero_cuenta'], unique=True)
+    op.create_index(op.f('ix_clientes_numero_identificacion'), 'clientes', ['numero_identificacion'], unique=True)
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_admin', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_clientes_numero_identificacion'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_numero_cuenta'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_id'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_correo_electronico'), table_name='clientes')
+    op.drop_table('clientes')
     # ### end Alembic commands ###
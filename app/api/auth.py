@@ -5,10 +5,12 @@ from sqlalchemy import select
 from datetime import timedelta
 
 from app.db.database import get_db
-from app.core.auth import verify_password, get_password_hash, create_access_token
+from app.core.auth import verify_password_async, get_password_hash_async, create_access_token
 from app.core.config import settings
+from app.core.dependencies import get_admin_user
+from app.crud.user import user_crud
 from app.models.user import User
-from app.schemas.user import UserCreate, User as UserSchema, Token
+from app.schemas.user import UserCreate, User as UserSchema, UserFlagsUpdate, Token
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -25,7 +27,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         )
     
     # Crear usuario
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = User(
         username=user_data.username,
         email=user_data.email,
@@ -49,7 +51,7 @@ async def login(
     result = await db.execute(select(User).where(User.username == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas",
@@ -69,4 +71,22 @@ async def login(
         expires_delta=access_token_expires
     )
     
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.patch("/usuarios/{username}", response_model=UserSchema)
+async def actualizar_estado_usuario(
+    username: str,
+    flags: UserFlagsUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(get_admin_user)
+):
+    """Activar/desactivar un usuario o cambiar su rol de administrador"""
+    user = await user_crud.update_flags(db, username, flags)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+    
+    return user
\ No newline at end of file
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Optional, List, Union
 import math
 import logging
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db, get_replica_db, ReadSessionLocal
 from app.core.dependencies import get_current_user, get_admin_user
 from app.crud.cliente import cliente_crud
-from app.schemas.cliente import Cliente, ClienteCreate, ClienteUpdate, ClienteList
+from app.schemas.cliente import (
+    Cliente, ClienteCreate, ClienteUpdate, ClienteList, ClienteCursorList, ModoConteoEnum,
+    FormatoEnum, LoteIds, LoteEmails, LoteCuentas, ClienteLote
+)
+from app.schemas.importacion import ResultadoImportacion
 from app.schemas.user import User
-from app.models.cliente import TipoClienteEnum
+from app.models.cliente import Cliente as ClienteModel, TipoClienteEnum
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.formatos import iter_registros, json_row, serialize_rows
+from app.core.respuestas import PydanticJSONResponse, responder, sin_revalidar
 
 router = APIRouter(prefix="/clientes", tags=["clientes"])
 
@@ -25,61 +31,98 @@ async def crear_cliente(
 ):
     """Crear un nuevo cliente"""
     try:
-        logger.info(f"Iniciando creación de cliente con email: {cliente_data.correo_electronico}")
-        
-        # Verificar si ya existe cliente con mismo email o número de cuenta
-        existing_email = await cliente_crud.get_by_email(db, cliente_data.correo_electronico)
-        if existing_email:
-            logger.warning(f"Email ya existe: {cliente_data.correo_electronico}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Ya existe un cliente con este correo electrónico"
-            )
-        
-        logger.info("Email verificado, no existe duplicado")
-        
-        existing_account = await cliente_crud.get_by_numero_cuenta(db, cliente_data.numero_cuenta)
-        if existing_account:
-            logger.warning(f"Número de cuenta ya existe: {cliente_data.numero_cuenta}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Ya existe un cliente con este número de cuenta"
-            )
-        
-        logger.info("Número de cuenta verificado, no existe duplicado")
-        
-        # Intentar crear el cliente
-        logger.info("Creando cliente...")
+        # Los índices únicos detectan email, cuenta o identificación duplicados
+        # en el propio INSERT, sin consultas previas
         cliente = await cliente_crud.create(db, cliente_data)
-        logger.info(f"Cliente creado exitosamente con ID: {cliente.id}")
+        logger.debug("Cliente creado con ID %s", cliente.id)
         
-        return cliente
+        return responder(cliente, Cliente, status_code=status.HTTP_201_CREATED)
     
     except HTTPException:
         # Re-raise HTTP exceptions (validaciones de negocio)
         raise
     except ValueError as e:
-        logger.error(f"ValueError al crear cliente: {str(e)}")
+        logger.info("Cliente rechazado: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error inesperado al crear cliente: {str(e)}", exc_info=True)
+        logger.error("Error inesperado al crear cliente: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ocurrió un error interno inesperado."
         )
 
 
+@router.post("/importar", response_model=ResultadoImportacion)
+async def importar_clientes(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user),
+    formato: FormatoEnum = Query(FormatoEnum.NDJSON, description="Formato del cuerpo: NDJSON o CSV con cabecera"),
+    lote: int = Query(1000, ge=1, le=4000, description="Filas por INSERT y por transacción")
+):
+    """Importar clientes de forma masiva desde el cuerpo de la petición (streaming)"""
+    try:
+        resultado = await cliente_crud.bulk_create(
+            db,
+            iter_registros(request.stream(), formato.value),
+            batch_size=lote
+        )
+        logger.info("Importación finalizada: %d/%d clientes insertados", resultado.insertados, resultado.total)
+        return resultado
+    
+    except Exception as e:
+        logger.error("Error inesperado al importar clientes: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ocurrió un error interno inesperado."
+        )
+
+@router.get("/exportar")
+async def exportar_clientes(
+    current_user: User = Depends(get_admin_user),
+    formato: FormatoEnum = Query(FormatoEnum.NDJSON, description="Formato de salida: NDJSON o CSV"),
+    nombre: Optional[str] = Query(None, description="Filtrar por nombre (contiene el texto)"),
+    nombre_prefijo: Optional[str] = Query(
+        None,
+        max_length=100,
+        description="Filtrar por prefijo del nombre (usa el índice de nombre)"
+    ),
+    tipo_cliente: Optional[TipoClienteEnum] = Query(None, description="Filtrar por tipo de cliente"),
+    q: Optional[str] = Query(None, max_length=100, description="Búsqueda por nombre y apellido")
+):
+    """Exportar clientes en streaming, sin límite de tamaño de página"""
+    async def generar():
+        # La sesión vive lo mismo que la respuesta, no lo que la dependencia
+        async with ReadSessionLocal() as session:
+            partitions = cliente_crud.stream_rows(
+                session,
+                nombre=nombre,
+                tipo_cliente=tipo_cliente.value if tipo_cliente else None,
+                q=q,
+                nombre_prefijo=nombre_prefijo
+            )
+            columnas = [column.name for column in ClienteModel.__table__.columns]
+            async for chunk in serialize_rows(partitions, formato.value, columnas):
+                yield chunk
+    
+    media_type = "text/csv" if formato == FormatoEnum.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        generar(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=clientes.{formato.value}"}
+    )
+
 @router.get("/{cliente_id}", response_model=Cliente)
 async def obtener_cliente(
     cliente_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Consultar un cliente por su ID"""
-    cliente = await cliente_crud.get_by_id(db, cliente_id)
+    cliente = await cliente_crud.get_cached(db, cliente_id)
     
     if not cliente:
         raise HTTPException(
@@ -87,7 +130,7 @@ async def obtener_cliente(
             detail="Cliente no encontrado"
         )
     
-    return cliente
+    return responder(cliente)
 
 @router.put("/{cliente_id}", response_model=Cliente)
 async def actualizar_cliente(
@@ -98,57 +141,106 @@ async def actualizar_cliente(
 ):
     """Actualizar los datos de un cliente existente"""
     try:
-        # Verificar si el cliente existe
-        existing_cliente = await cliente_crud.get_by_id(db, cliente_id)
-        if not existing_cliente:
+        # La unicidad de email y número de cuenta la validan los índices únicos
+        cliente = await cliente_crud.update(db, cliente_id, cliente_update)
+        if not cliente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Cliente no encontrado"
             )
-        
-        # Si se está actualizando email o número de cuenta, verificar unicidad
-        if cliente_update.correo_electronico:
-            existing_email = await cliente_crud.get_by_email(db, cliente_update.correo_electronico)
-            if existing_email and existing_email.id != cliente_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Ya existe un cliente con este correo electrónico"
-                )
-        
-        if cliente_update.numero_cuenta:
-            existing_account = await cliente_crud.get_by_numero_cuenta(db, cliente_update.numero_cuenta)
-            if existing_account and existing_account.id != cliente_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Ya existe un cliente con este número de cuenta"
-                )
-        
-        cliente = await cliente_crud.update(db, cliente_id, cliente_update)
-        return cliente
+        return responder(cliente, Cliente)
     
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error inesperado al listar clientes: {str(e)}", exc_info=True)
+        logger.error("Error inesperado al actualizar cliente: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ocurrió un error interno inesperado."
         )
 
-@router.get("/", response_model=ClienteList)
+def _proyeccion(contenido: dict) -> PydanticJSONResponse:
+    """Serializar una página proyectada sin validar cada fila con el schema completo"""
+    contenido["clientes"] = [json_row(fila) for fila in contenido["clientes"]]
+    return PydanticJSONResponse(contenido)
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """Columnas pedidas en `fields=`; el ID se incluye siempre"""
+    if fields is None:
+        return None
+    columnas = ["id"]
+    for campo in fields.split(","):
+        campo = campo.strip()
+        if not campo or campo in columnas:
+            continue
+        if campo not in Cliente.model_fields:
+            raise ValueError(f"Campo desconocido en fields: {campo}")
+        columnas.append(campo)
+    return columnas
+
+@router.get("/", response_model=Union[ClienteList, ClienteCursorList])
 async def listar_clientes(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
-    nombre: Optional[str] = Query(None, description="Filtrar por nombre"),
-    tipo_cliente: Optional[TipoClienteEnum] = Query(None, description="Filtrar por tipo de cliente")
+    cursor: Optional[str] = Query(
+        None,
+        description="Paginación por cursor: enviar vacío para la primera página y luego el `next_cursor` recibido"
+    ),
+    nombre: Optional[str] = Query(None, description="Filtrar por nombre (contiene el texto)"),
+    nombre_prefijo: Optional[str] = Query(
+        None,
+        max_length=100,
+        description="Filtrar por prefijo del nombre (usa el índice de nombre)"
+    ),
+    tipo_cliente: Optional[TipoClienteEnum] = Query(None, description="Filtrar por tipo de cliente"),
+    q: Optional[str] = Query(
+        None,
+        max_length=100,
+        description="Búsqueda por nombre y apellido (índice FULLTEXT), ordenada por relevancia"
+    ),
+    count: ModoConteoEnum = Query(
+        ModoConteoEnum.EXACT,
+        description="Cálculo del total: exacto, estimado (estadísticas o caché corta) u omitido"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a devolver separados por comas, p. ej. `nombre,numero_cuenta` (el ID siempre se incluye)"
+    )
 ):
     """Consultar todos los clientes con paginación y filtros"""
     try:
+        columnas = _parse_fields(fields)
+        
+        if cursor is not None:
+            # Paginación por cursor: coste constante sin importar la profundidad
+            clientes, has_more = await cliente_crud.get_page_after(
+                db=db,
+                after_id=decode_cursor(cursor),
+                limit=size,
+                nombre=nombre,
+                tipo_cliente=tipo_cliente.value if tipo_cliente else None,
+                q=q,
+                columnas=columnas,
+                nombre_prefijo=nombre_prefijo
+            )
+            
+            next_cursor = encode_cursor(clientes[-1]["id"] if columnas else clientes[-1].id) if has_more else None
+            if columnas:
+                return _proyeccion({"clientes": clientes, "size": size, "next_cursor": next_cursor})
+            
+            return responder(ClienteCursorList(
+                clientes=sin_revalidar(Cliente, clientes),
+                size=size,
+                next_cursor=next_cursor
+            ))
+        
         skip = (page - 1) * size
         
         clientes, total = await cliente_crud.get_all(
@@ -156,21 +248,42 @@ async def listar_clientes(
             skip=skip,
             limit=size,
             nombre=nombre,
-            tipo_cliente=tipo_cliente.value if tipo_cliente else None
+            tipo_cliente=tipo_cliente.value if tipo_cliente else None,
+            conteo=count,
+            q=q,
+            columnas=columnas,
+            nombre_prefijo=nombre_prefijo
         )
         
-        total_pages = math.ceil(total / size) if total > 0 else 1
+        if total is None:
+            total_pages = None
+        else:
+            total_pages = math.ceil(total / size) if total > 0 else 1
         
-        return ClienteList(
-            clientes=clientes,
+        if columnas:
+            return _proyeccion({
+                "clientes": clientes,
+                "total": total,
+                "page": page,
+                "size": size,
+                "pages": total_pages
+            })
+        
+        return responder(ClienteList(
+            clientes=sin_revalidar(Cliente, clientes),
             total=total,
             page=page,
             size=size,
             pages=total_pages
-        )
+        ))
     
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
-        logger.error(f"Error inesperado al listar clientes: {str(e)}", exc_info=True)
+        logger.error("Error inesperado al listar clientes: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ocurrió un error interno inesperado."
@@ -199,7 +312,7 @@ async def eliminar_cliente(
         raise
         
     except Exception as e:
-        logger.error(f"Error inesperado al eliminar cliente: {str(e)}", exc_info=True)
+        logger.error("Error inesperado al eliminar cliente: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ocurrió un error interno inesperado."
@@ -210,11 +323,11 @@ async def eliminar_cliente(
 @router.get("/buscar/email/{email}", response_model=Cliente)
 async def buscar_por_email(
     email: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Buscar cliente por email"""
-    cliente = await cliente_crud.get_by_email(db, email)
+    cliente = await cliente_crud.get_cached_by_email(db, email)
     
     if not cliente:
         raise HTTPException(
@@ -222,16 +335,16 @@ async def buscar_por_email(
             detail="Cliente no encontrado"
         )
     
-    return cliente
+    return responder(cliente)
 
 @router.get("/buscar/cuenta/{numero_cuenta}", response_model=Cliente)
 async def buscar_por_numero_cuenta(
     numero_cuenta: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Buscar cliente por número de cuenta"""
-    cliente = await cliente_crud.get_by_numero_cuenta(db, numero_cuenta)
+    cliente = await cliente_crud.get_cached_by_numero_cuenta(db, numero_cuenta)
     
     if not cliente:
         raise HTTPException(
@@ -239,4 +352,40 @@ async def buscar_por_numero_cuenta(
             detail="Cliente no encontrado"
         )
     
-    return cliente
\ No newline at end of file
+    return responder(cliente)
+
+def _resultado_lote(claves: list, clientes: list) -> ClienteLote:
+    """Emparejar cada clave con su cliente, marcando los no encontrados"""
+    resultados = [
+        {"clave": clave, "encontrado": cliente is not None, "cliente": cliente}
+        for clave, cliente in zip(claves, sin_revalidar(Cliente, clientes))
+    ]
+    no_encontrados = sum(1 for cliente in clientes if cliente is None)
+    return ClienteLote(resultados=resultados, no_encontrados=no_encontrados)
+
+@router.post("/lote/ids", response_model=ClienteLote)
+async def buscar_lote_ids(
+    lote: LoteIds,
+    db: AsyncSession = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Buscar varios clientes por ID"""
+    return responder(_resultado_lote(lote.ids, await cliente_crud.get_many_by_ids(db, lote.ids)))
+
+@router.post("/lote/emails", response_model=ClienteLote)
+async def buscar_lote_emails(
+    lote: LoteEmails,
+    db: AsyncSession = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Buscar varios clientes por email"""
+    return responder(_resultado_lote(lote.emails, await cliente_crud.get_many_by_emails(db, lote.emails)))
+
+@router.post("/lote/cuentas", response_model=ClienteLote)
+async def buscar_lote_cuentas(
+    lote: LoteCuentas,
+    db: AsyncSession = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Buscar varios clientes por número de cuenta"""
+    return responder(_resultado_lote(lote.cuentas, await cliente_crud.get_many_by_numeros_cuenta(db, lote.cuentas)))
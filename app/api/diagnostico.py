@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+
+from app.core.auth import token_cache_stats
+from app.core.dependencies import get_admin_user
+from app.core.metricas import registry
+from app.crud.cliente import cliente_cache
+from app.crud.user import user_cache
+from app.db.database import engine, replica_engines
+from app.db.pool import pool_status
+from app.schemas.user import User
+
+router = APIRouter(prefix="/diagnostico", tags=["diagnostico"])
+
+@router.get("/pool")
+async def estado_pool(current_user: User = Depends(get_admin_user)):
+    """Estado del pool de conexiones: en uso, overflow, esperas y timeouts"""
+    return {
+        "primary": pool_status(engine.pool),
+        "replicas": [pool_status(replica.pool) for replica in replica_engines],
+    }
+
+@router.get("/cache")
+async def estado_cache(current_user: User = Depends(get_admin_user)):
+    """Aciertos y fallos de las cachés de este proceso"""
+    return {
+        "clientes": cliente_cache.stats(),
+        "usuarios": user_cache.stats(),
+        "tokens": token_cache_stats(),
+    }
+
+def _metricas_pool():
+    pools = [("primary", engine)] + [(f"replica{i}", replica) for i, replica in enumerate(replica_engines)]
+    for nombre, motor in pools:
+        estado = pool_status(motor.pool)
+        etiquetas = {"pool": nombre}
+        yield "db_pool_checked_out", "gauge", "Conexiones en uso", etiquetas, estado["checked_out"]
+        yield "db_pool_checkouts_total", "counter", "Conexiones obtenidas del pool", etiquetas, estado["checkouts"]
+        yield "db_pool_timeouts_total", "counter", "Timeouts por pool agotado", etiquetas, estado["timeouts"]
+        yield "db_pool_slow_checkouts_total", "counter", "Esperas lentas por conexión", etiquetas, estado["slow_checkouts"]
+
+def _metricas_cache():
+    caches = {"clientes": cliente_cache.stats(), "usuarios": user_cache.stats(), "tokens": token_cache_stats()}
+    for nombre, stats in caches.items():
+        etiquetas = {"cache": nombre}
+        yield "cache_hits_total", "counter", "Aciertos de caché", etiquetas, stats["hits"]
+        yield "cache_misses_total", "counter", "Fallos de caché", etiquetas, stats["misses"]
+
+registry.add_collector(_metricas_pool)
+registry.add_collector(_metricas_cache)
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.db.database import get_db, get_replica_db
+from app.core.dependencies import get_current_user, get_admin_user
+from app.crud.estadisticas import estadisticas_crud, DIMENSIONES
+from app.models.cliente import TipoClienteEnum
+from app.schemas.estadisticas import ResumenSaldos, ResultadoReconstruccion
+from app.schemas.user import User
+
+router = APIRouter(prefix="/estadisticas", tags=["estadisticas"])
+
+def _parse_agrupar_por(agrupar_por: str) -> list[str]:
+    """Dimensiones pedidas, sin repetir y en el orden recibido"""
+    dimensiones = []
+    for dimension in agrupar_por.split(","):
+        dimension = dimension.strip()
+        if not dimension or dimension in dimensiones:
+            continue
+        if dimension not in DIMENSIONES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Dimensión desconocida: {dimension}. Valores posibles: {', '.join(DIMENSIONES)}"
+            )
+        dimensiones.append(dimension)
+    return dimensiones
+
+@router.get("/saldos", response_model=ResumenSaldos, response_model_exclude_unset=True)
+async def resumen_saldos(
+    db: AsyncSession = Depends(get_replica_db),
+    current_user: User = Depends(get_current_user),
+    agrupar_por: str = Query(
+        "tipo_cliente",
+        description="Dimensiones separadas por comas: tipo_cliente, nacionalidad, genero, rango_edad (vacío = total)"
+    ),
+    tipo_cliente: Optional[TipoClienteEnum] = Query(None, description="Filtrar por tipo de cliente")
+):
+    """Número de clientes, saldo total y saldo promedio por grupo"""
+    dimensiones = _parse_agrupar_por(agrupar_por)
+    grupos = await estadisticas_crud.saldos(
+        db,
+        dimensiones,
+        tipo_cliente=tipo_cliente.value if tipo_cliente else None
+    )
+    return {"agrupar_por": dimensiones, "grupos": grupos}
+
+@router.post("/reconstruir", response_model=ResultadoReconstruccion)
+async def reconstruir_resumen(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Recalcular el resumen desde la tabla de clientes (tras cargas hechas fuera de la API)"""
+    return {"grupos": await estadisticas_crud.reconstruir(db)}
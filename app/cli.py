@@ -1,35 +1,53 @@
 import asyncio
 import typer
+import click
+import os
 import sys
-import re
 from pathlib import Path
-from sqlalchemy import select
-from email_validator import validate_email, EmailNotValidError
+from typing import Optional
 
 # Añadir el directorio raíz del proyecto al sys.path
 sys.path.insert(0, Path(__file__).resolve().parents[1].as_posix())
 
-from app.db.database import AsyncSessionLocal, engine
-from app.models.user import User
-from app.core.auth import get_password_hash
+# Los módulos de la aplicación (Settings, engine, modelos, CRUD) se importan dentro
+# de cada comando: `--help` no necesita DATABASE_URL y cada comando solo carga lo que usa.
+# Medir con: python benchmarks/bench_importtime.py
+
+# Valores de FormatoEnum y TipoClienteEnum, repetidos para no cargar pydantic ni
+# SQLAlchemy solo por declarar las opciones
+FORMATOS = ("ndjson", "csv")
+TIPOS_CLIENTE = ("individual", "corporativo", "vip")
 
 app = typer.Typer()
 
+def ejecutar(funcion, *args):
+    """Ejecutar la parte asíncrona de un comando y cerrar las conexiones al terminar, también si falla"""
+    async def con_cierre():
+        from app.db.database import dispose_engines
+        try:
+            return await funcion(*args)
+        finally:
+            await dispose_engines()
+    return asyncio.run(con_cierre())
+
 def is_password_strong_enough(password: str) -> bool:
     """Verifica que la contraseña cumpla con los requisitos de seguridad."""
-    if len(password) < 8:
-        print(f"\033[91mError: La contraseña debe tener al menos 8 caracteres.\033[0m")
-        return False
-    if not re.search(r"[A-Z]", password):
-        print(f"\033[91mError: La contraseña debe contener al menos una letra mayúscula.\033[0m")
-        return False
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-        print(f"\033[91mError: La contraseña debe contener al menos un carácter especial.\033[0m")
+    from app.schemas.user import comprobar_password
+
+    try:
+        comprobar_password(password)
+    except ValueError as e:
+        print(f"\033[91mError: {e}\033[0m")
         return False
     return True
 
 async def create_admin_user(username: str, email: str, password: str):
     """Lógica para crear el usuario admin en la base de datos."""
+    from sqlalchemy import select
+    from app.db.database import AsyncSessionLocal
+    from app.models.user import User
+    from app.core.auth import get_password_hash_async
+
     async with AsyncSessionLocal() as session:
         # Verificar si el usuario o el email ya existen
         result = await session.execute(select(User).where(
@@ -40,7 +58,7 @@ async def create_admin_user(username: str, email: str, password: str):
             return
 
         # Crear el nuevo usuario administrador
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         admin_user = User(
             username=username,
             email=email,
@@ -48,24 +66,20 @@ async def create_admin_user(username: str, email: str, password: str):
             is_active=True,
             is_admin=True
         )
-        
+
         session.add(admin_user)
         await session.commit()
         print(f"\033[92m¡Usuario administrador '{username}' creado exitosamente!\033[0m")
-    
-    # Cerrar el pool de conexiones del engine
-    await engine.dispose()
 
-@app.callback(invoke_without_command=True)
-def main(ctx: typer.Context):
-    """
-    Crea un usuario administrador inicial de forma interactiva y segura.
-    """
+def pedir_datos_admin() -> tuple[str, str, str]:
+    """Solicitar de forma interactiva usuario, email y contraseña del administrador."""
+    from email_validator import validate_email, EmailNotValidError
+
     print("--- Creación de Usuario Administrador ---")
-    
+
     # Solicitar datos de forma interactiva
     username = typer.prompt("Nombre de usuario para el administrador")
-    
+
     while True:
         email_input = typer.prompt("Email para el administrador")
         try:
@@ -87,9 +101,197 @@ def main(ctx: typer.Context):
         else:
             print("\033[93mPor favor, elige una contraseña más segura.\033[0m")
 
+    return username, email_input, password
+
+@app.command("crear-admin")
+def crear_admin():
+    """
+    Crea un usuario administrador de forma interactiva y segura.
+    """
+    ejecutar(create_admin_user, *pedir_datos_admin())
+
+async def import_users(path: Path, formato: str, lote: int, procesos: int):
+    """Lógica para crear usuarios desde un fichero NDJSON o CSV, con bcrypt repartido en procesos."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from app.db.database import AsyncSessionLocal
+    from app.core.formatos import iter_file_chunks, iter_registros
+    from app.crud.user import user_crud
+
+    # spawn: no se heredan por fork los hilos del event loop ni del driver de la base de datos
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context("spawn")) as executor:
+        async with AsyncSessionLocal() as session:
+            resultado = await user_crud.bulk_create(
+                session,
+                iter_registros(iter_file_chunks(str(path)), formato),
+                hash_executor=executor,
+                hash_workers=procesos,
+                batch_size=lote
+            )
+
+    for error in resultado.errores:
+        print(f"\033[91mFila {error.fila}: {error.error}\033[0m")
+    if resultado.errores_omitidos:
+        print(f"\033[93m... y {resultado.errores_omitidos} errores más.\033[0m")
+    print(f"\033[92m{resultado.insertados} de {resultado.total} usuarios creados.\033[0m")
+
+@app.command("crear-usuarios")
+def crear_usuarios(
+    archivo: Path = typer.Argument(
+        ..., exists=True, dir_okay=False,
+        help="Fichero NDJSON o CSV con username, email, password y opcionalmente is_active e is_admin"
+    ),
+    formato: str = typer.Option("ndjson", click_type=click.Choice(FORMATOS), help="Formato del fichero"),
+    lote: int = typer.Option(500, min=1, max=4000, help="Usuarios por INSERT y por transacción"),
+    procesos: int = typer.Option(os.cpu_count() or 1, min=1, help="Procesos que calculan los hashes bcrypt"),
+):
+    """
+    Crea usuarios de forma masiva y no interactiva desde un fichero NDJSON o CSV.
+    """
+    ejecutar(import_users, archivo, formato, lote, procesos)
+
+async def import_clientes(path: Path, formato: str, lote: int):
+    """Lógica para importar clientes desde un fichero NDJSON o CSV."""
+    from app.db.database import AsyncSessionLocal
+    from app.core.formatos import iter_file_chunks, iter_registros
+    from app.crud.cliente import cliente_crud
+
+    async with AsyncSessionLocal() as session:
+        resultado = await cliente_crud.bulk_create(
+            session,
+            iter_registros(iter_file_chunks(str(path)), formato),
+            batch_size=lote
+        )
+
+    for error in resultado.errores:
+        print(f"\033[91mFila {error.fila}: {error.error}\033[0m")
+    if resultado.errores_omitidos:
+        print(f"\033[93m... y {resultado.errores_omitidos} errores más.\033[0m")
+    print(f"\033[92m{resultado.insertados} de {resultado.total} clientes importados.\033[0m")
+
+@app.command("importar-clientes")
+def importar_clientes(
+    archivo: Path = typer.Argument(..., exists=True, dir_okay=False, help="Fichero NDJSON o CSV con cabecera"),
+    formato: str = typer.Option("ndjson", click_type=click.Choice(FORMATOS), help="Formato del fichero"),
+    lote: int = typer.Option(1000, min=1, max=4000, help="Filas por INSERT y por transacción"),
+):
+    """
+    Importa clientes de forma masiva desde un fichero NDJSON o CSV.
+    """
+    ejecutar(import_clientes, archivo, formato, lote)
+
+async def export_clientes(
+    path: Path,
+    formato: str,
+    nombre: Optional[str],
+    tipo_cliente: Optional[str],
+    nombre_prefijo: Optional[str]
+):
+    """Lógica para exportar clientes a un fichero NDJSON o CSV."""
+    from app.db.database import AsyncSessionLocal
+    from app.core.formatos import serialize_rows
+    from app.crud.cliente import cliente_crud
+    from app.models.cliente import Cliente
+
+    total_bytes = 0
+    async with AsyncSessionLocal() as session:
+        partitions = cliente_crud.stream_rows(
+            session,
+            nombre=nombre,
+            tipo_cliente=tipo_cliente,
+            nombre_prefijo=nombre_prefijo
+        )
+        columnas = [column.name for column in Cliente.__table__.columns]
+        with open(path, "wb") as f:
+            async for chunk in serialize_rows(partitions, formato, columnas):
+                f.write(chunk)
+                total_bytes += len(chunk)
+
+    print(f"\033[92mExportación completada en '{path}' ({total_bytes} bytes).\033[0m")
+
+@app.command("exportar-clientes")
+def exportar_clientes(
+    archivo: Path = typer.Argument(..., dir_okay=False, help="Fichero de salida"),
+    formato: str = typer.Option("ndjson", click_type=click.Choice(FORMATOS), help="Formato de salida"),
+    nombre: str = typer.Option(None, help="Filtrar por nombre (contiene el texto)"),
+    tipo_cliente: str = typer.Option(None, click_type=click.Choice(TIPOS_CLIENTE), help="Filtrar por tipo de cliente"),
+    nombre_prefijo: str = typer.Option(None, help="Filtrar por prefijo del nombre (usa el índice de nombre)"),
+):
+    """
+    Exporta clientes en streaming a un fichero NDJSON o CSV.
+    """
+    ejecutar(export_clientes, archivo, formato, nombre, tipo_cliente, nombre_prefijo)
+
+async def reindex(optimizar: bool):
+    """Lógica para reconstruir el resumen de clientes y refrescar las estadísticas del optimizador."""
+    from app.db.database import AsyncSessionLocal, engine
+    from app.crud.estadisticas import estadisticas_crud
+
+    async with AsyncSessionLocal() as session:
+        grupos = await estadisticas_crud.reconstruir(session)
+    print(f"\033[92mResumen de clientes reconstruido: {grupos} grupos.\033[0m")
+
+    dialecto = engine.dialect.name
+    async with engine.begin() as conn:
+        if dialecto == "mysql":
+            if optimizar:
+                # Reconstruye la tabla y el índice FULLTEXT tras borrados o cargas masivas
+                await conn.exec_driver_sql("OPTIMIZE TABLE clientes")
+            await conn.exec_driver_sql("ANALYZE TABLE clientes, clientes_resumen, users")
+        elif dialecto == "sqlite":
+            if optimizar:
+                await conn.exec_driver_sql("REINDEX")
+            await conn.exec_driver_sql("ANALYZE")
+        else:
+            print(f"\033[93mEstadísticas del optimizador no soportadas en {dialecto}.\033[0m")
+            return
+    print("\033[92mEstadísticas de las tablas actualizadas.\033[0m")
+
+@app.command("reindexar")
+def reindexar(
+    optimizar: bool = typer.Option(False, help="Reconstruir también la tabla y sus índices (bloquea escrituras en MySQL)"),
+):
+    """
+    Reconstruye el resumen de estadísticas y actualiza las estadísticas de índices.
+    """
+    ejecutar(reindex, optimizar)
+
+async def warm_cache(limite: int):
+    """Lógica para cargar los clientes más recientes en la caché compartida."""
+    from app.db.database import ReadSessionLocal
+    from app.crud.cliente import cliente_crud
+
+    # Lectura desde una réplica si hay alguna configurada
+    async with ReadSessionLocal() as session:
+        total = await cliente_crud.warm_cache(session, limite)
+    print(f"\033[92m{total} clientes cargados en la caché.\033[0m")
+
+@app.command("calentar-cache")
+def calentar_cache(
+    limite: int = typer.Option(10000, min=1, help="Clientes más recientes que se cargan"),
+):
+    """
+    Carga en la caché compartida (CACHE_URL) los clientes más recientes.
+    """
+    from app.core.config import settings
+
+    # La caché en memoria vive en cada proceso: la de este comando se perdería al salir
+    if not settings.CACHE_URL:
+        print("\033[91mError: calentar-cache requiere una caché compartida (CACHE_URL).\033[0m")
+        raise typer.Exit(code=1)
+    ejecutar(warm_cache, limite)
+
+@app.callback(invoke_without_command=True)
+def main(ctx: typer.Context):
+    """
+    Herramientas de administración. Sin subcomando crea un usuario administrador
+    de forma interactiva (equivale a `crear-admin`).
+    """
+    # Con un subcomando (p. ej. importar-clientes) no se crea el administrador
+    if ctx.invoked_subcommand is not None:
+        return
 
-    # Ejecutar la lógica asíncrona
-    asyncio.run(create_admin_user(username, email_input, password))
+    ejecutar(create_admin_user, *pedir_datos_admin())
 
 if __name__ == "__main__":
     app()
@@ -1,13 +1,21 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 # Configuración para hashing de passwords
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Claims de tokens ya verificados, indexados por su digest hasta su `exp`
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar password"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -16,6 +24,32 @@ def get_password_hash(password: str) -> str:
     """Hash de password"""
     return pwd_context.hash(password)
 
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash de un bloque de passwords (función de módulo para poder enviarla a otro proceso)"""
+    return [get_password_hash(password) for password in passwords]
+
+# bcrypt libera el GIL, así que un pool de hilos acotado basta para sacar
+# el hashing del event loop y limitar cuántos se calculan a la vez
+_hash_executor = (
+    ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    if settings.PASSWORD_HASH_WORKERS > 0 else None
+)
+
+async def _run_hashing(func, *args):
+    """Ejecutar una operación de bcrypt en el pool sin bloquear el event loop"""
+    if _hash_executor is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, func, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verificar password fuera del event loop"""
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash de password fuera del event loop"""
+    return await _run_hashing(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Crear JWT token"""
     to_encode = data.copy()
@@ -28,10 +62,31 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def _decode_token(token: str) -> dict:
+    """Decodificar y verificar la firma de un token, usando la caché si es posible"""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+    
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    
+    # Solo se guarda mientras el token siga vigente
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            _token_cache.set(key, payload, ttl)
+    return payload
+
+def token_cache_stats() -> dict:
+    """Aciertos y fallos de la caché de tokens verificados"""
+    return _token_cache.stats()
+
 def verify_token(token: str):
     """Verificar JWT token"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(
@@ -0,0 +1,241 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Mapping, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Caché en memoria del proceso con expiración (TTL) y desalojo LRU"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obtener un valor vigente o `default` si no existe o expiró"""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Guardar un valor; `ttl` permite una expiración distinta por entrada"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Eliminar una entrada si existe"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vaciar la caché"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Aciertos, fallos y tamaño actual"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend:
+    """Interfaz de caché asíncrona con valores serializados como texto"""
+
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        """Invalidar claves: además de borrarlas, anota el sello de la invalidación"""
+        raise NotImplementedError
+
+    async def fill_token(self) -> int:
+        """Sello actual de invalidaciones; se toma antes de leer de la BD lo que se va a guardar"""
+        raise NotImplementedError
+
+    async def recently_invalidated(self, key: str) -> bool:
+        """Si `key` se invalidó dentro del TTL: una réplica con retraso aún podría tener la versión anterior"""
+        raise NotImplementedError
+
+    async def set_if_valid(self, items: Mapping[str, str], token: int, from_replica: bool = False) -> bool:
+        """Guardar `items` salvo que alguna clave se haya invalidado después de `token`
+
+        Evita que una lectura anterior a un commit vuelva a dejar en la caché el valor
+        que ese commit acaba de invalidar. Con `from_replica` tampoco se guarda si alguna
+        clave se invalidó dentro del TTL, aunque fuera antes de `token`.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Aciertos, fallos y ratio de aciertos de este proceso"""
+        raise NotImplementedError
+
+
+def _hit_ratio(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+class MemoryBackend(CacheBackend):
+    """Backend local: un TTLCache por proceso"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = ttl
+        # Sello e instante de la última invalidación de cada clave (LRU acotado); una clave
+        # olvidada cuenta como invalidada en la más reciente descartada, nunca antes
+        self._sello = 0
+        self._invalidaciones: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+        self._max_invalidaciones = maxsize
+        self._descartada: tuple[int, float] = (0, float("-inf"))
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self._sello += 1
+        for key in keys:
+            self._cache.delete(key)
+            self._invalidaciones[key] = (self._sello, time.monotonic())
+            self._invalidaciones.move_to_end(key)
+        while len(self._invalidaciones) > self._max_invalidaciones:
+            # Por orden de invalidación: la descartada siempre es la más antigua
+            self._descartada = self._invalidaciones.popitem(last=False)[1]
+
+    def _invalidada(self, key: str, token: int, reciente: bool) -> bool:
+        sello, instante = self._invalidaciones.get(key, self._descartada)
+        return sello > token or (reciente and time.monotonic() - instante < self._ttl)
+
+    async def fill_token(self) -> int:
+        return self._sello
+
+    async def recently_invalidated(self, key: str) -> bool:
+        return self._invalidada(key, self._sello, reciente=True)
+
+    async def set_if_valid(self, items: Mapping[str, str], token: int, from_replica: bool = False) -> bool:
+        if any(self._invalidada(key, token, from_replica) for key in items):
+            return False
+        for key, value in items.items():
+            self._cache.set(key, value)
+        return True
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        stats["hit_ratio"] = _hit_ratio(stats["hits"], stats["misses"])
+        return stats
+
+
+# Borra las claves y anota en `<namespace>!inv:<clave>` el sello de la invalidación, en una sola operación
+_LUA_INVALIDAR = """
+local sello = redis.call('INCR', KEYS[1])
+local n = (#KEYS - 1) / 2
+for i = 2, n + 1 do
+    redis.call('DEL', KEYS[i])
+    redis.call('SET', KEYS[i + n], sello, 'PX', ARGV[1])
+end
+return sello
+"""
+
+# Guarda las claves solo si ninguna se ha invalidado después del sello ARGV[1]; con
+# ARGV[3] = "1" (lectura de réplica), tampoco si alguna tiene sello vigente (dentro del TTL)
+_LUA_GUARDAR_SI_VIGENTE = """
+local n = #KEYS / 2
+for i = 1, n do
+    local sello = redis.call('GET', KEYS[n + i])
+    if sello and (ARGV[3] == '1' or tonumber(sello) > tonumber(ARGV[1])) then
+        return 0
+    end
+end
+for i = 1, n do
+    redis.call('SET', KEYS[i], ARGV[i + 3], 'PX', ARGV[2])
+end
+return 1
+"""
+
+
+class RedisBackend(CacheBackend):
+    """Backend compartido entre procesos y réplicas de la API"""
+
+    def __init__(self, url: str, namespace: str, ttl: float = 60.0):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_URL requiere instalar el paquete 'redis'")
+        self._client = redis.from_url(url, decode_responses=True)
+        self._prefix = f"{namespace}:"
+        # Sellos de invalidación fuera del espacio de las claves (un username podría llamarse "sello")
+        self._meta = f"{namespace}!"
+        self._invalidar = self._client.register_script(_LUA_INVALIDAR)
+        self._guardar_si_vigente = self._client.register_script(_LUA_GUARDAR_SI_VIGENTE)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._client.get(self._prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _ttl_ms(self, ttl: Optional[float] = None) -> int:
+        return max(int((self.ttl if ttl is None else ttl) * 1000), 1)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self._client.set(self._prefix + key, value, px=self._ttl_ms(ttl))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            # Los sellos duran lo mismo que las entradas: cubren las lecturas en curso y el retraso de las réplicas
+            await self._invalidar(
+                keys=[self._meta + "sello"]
+                + [self._prefix + key for key in keys]
+                + [self._meta + "inv:" + key for key in keys],
+                args=[self._ttl_ms()],
+            )
+
+    async def fill_token(self) -> int:
+        return int(await self._client.get(self._meta + "sello") or 0)
+
+    async def recently_invalidated(self, key: str) -> bool:
+        return bool(await self._client.exists(self._meta + "inv:" + key))
+
+    async def set_if_valid(self, items: Mapping[str, str], token: int, from_replica: bool = False) -> bool:
+        if not items:
+            return True
+        return bool(await self._guardar_si_vigente(
+            keys=[self._prefix + key for key in items] + [self._meta + "inv:" + key for key in items],
+            args=[token, self._ttl_ms(), "1" if from_replica else "0", *items.values()],
+        ))
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": _hit_ratio(self.hits, self.misses)}
+
+
+def create_cache_backend(namespace: str, maxsize: int, ttl: float) -> CacheBackend:
+    """Crear el backend configurado: Redis si hay CACHE_URL, memoria local si no"""
+    if settings.CACHE_URL:
+        return RedisBackend(settings.CACHE_URL, namespace, ttl)
+    return MemoryBackend(maxsize=maxsize, ttl=ttl)
@@ -4,16 +4,67 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_SLOW_CHECKOUT_MS: float = 100.0
+    # Conexiones máximas a cada servidor (primario y cada réplica) sumando todos los workers
+    # (0 = sin límite). Dejar margen respecto a max_connections de MySQL para migraciones y la CLI
+    DB_MAX_CONNECTIONS: int = 0
+    # Réplicas de lectura, separadas por comas (vacío = todo va al primario)
+    DATABASE_REPLICA_URLS: str = ""
+    # Umbral del log de consultas lentas (0 = desactivado)
+    SLOW_QUERY_MS: float = 500.0
+    # Permite perfilar peticiones con la cabecera `X-Profile: 1`
+    PROFILING_ENABLED: bool = False
+    
+    # Servidor (python -m app.server)
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 1
+    WEB_KEEPALIVE_SECONDS: int = 5
+    WEB_BACKLOG: int = 2048
+    # IPs de proxies de confianza para X-Forwarded-For / X-Forwarded-Proto
+    WEB_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    
+    # Logging: nivel, formato (json o text) y fracción de registros DEBUG que se conservan
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 10000
+    
+    # Hilos dedicados a bcrypt (0 = ejecutar en el event loop)
+    PASSWORD_HASH_WORKERS: int = 4
     
     # App
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "FinTechBank API"
     
+    # Conteos de listados
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    
+    # Caché (memoria local por defecto; CACHE_URL=redis://... para compartirla)
+    CACHE_URL: Optional[str] = None
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_SIZE: int = 10000
+    CLIENTE_CACHE_TTL_SECONDS: int = 30
+    CLIENTE_CACHE_SIZE: int = 50000
+    
+    # Serializar las respuestas de clientes con pydantic-core, sin revalidar response_model
+    FAST_JSON_RESPONSES: bool = False
+    
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
 
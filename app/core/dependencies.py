@@ -1,10 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from app.db.database import get_db
 from app.core.auth import verify_token
-from app.models.user import User
+from app.crud.user import user_crud
+from app.schemas.user import User
 
 security = HTTPBearer()
 
@@ -15,8 +15,8 @@ async def get_current_user(
     """Obtener usuario actual desde el token"""
     username = verify_token(credentials.credentials)
     
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalar_one_or_none()
+    # El principal se sirve desde caché; solo se consulta la BD si no está
+    user = await user_crud.get_principal(db, username)
     
     if user is None:
         raise HTTPException(
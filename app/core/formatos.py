@@ -0,0 +1,140 @@
+import codecs
+import csv
+import enum
+import io
+import json
+from collections import deque
+from decimal import Decimal
+from typing import Any, AsyncIterator, Mapping, Sequence, Union
+
+from pydantic_core import to_json
+
+# Registro leído de un fichero: (número de fila, datos o mensaje de error)
+Registro = tuple[int, Union[dict, str]]
+
+
+async def iter_file_chunks(path: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Leer un fichero en bloques, con la misma interfaz que `request.stream()`"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Convertir un flujo de bytes UTF-8 en líneas sin cargarlo completo en memoria"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pendiente = ""
+    async for chunk in chunks:
+        pendiente += decoder.decode(chunk)
+        *lineas, pendiente = pendiente.split("\n")
+        for linea in lineas:
+            yield linea.rstrip("\r")
+    pendiente += decoder.decode(b"", final=True)
+    if pendiente:
+        yield pendiente.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Registro]:
+    """Leer registros NDJSON; las líneas inválidas se devuelven como error"""
+    fila = 0
+    async for linea in iter_lines(chunks):
+        if not linea.strip():
+            continue
+        fila += 1
+        try:
+            datos: Any = json.loads(linea)
+        except ValueError as e:
+            yield fila, f"JSON inválido: {e}"
+            continue
+        if not isinstance(datos, dict):
+            yield fila, "Cada línea debe ser un objeto JSON"
+            continue
+        yield fila, datos
+
+
+class _ColaLineas(deque):
+    """Líneas pendientes para un csv.reader; se rellena desde el flujo asíncrono"""
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self:
+            raise StopIteration
+        return self.popleft()
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Registro]:
+    """Leer registros CSV con cabecera; las celdas vacías se omiten"""
+    # Un solo csv.reader para todo el fichero. Solo se le pasan registros completos:
+    # un campo entre comillas puede ocupar varias líneas
+    cola = _ColaLineas()
+    reader = csv.reader(cola)
+    cabecera = None
+    fila = 0
+    registro: list[str] = []
+    comillas = 0
+    async for linea in iter_lines(chunks):
+        if not registro and not linea.strip():
+            continue
+        registro.append(linea + "\n")
+        # Con un número impar de comillas el campo sigue abierto en la línea siguiente
+        comillas += linea.count('"')
+        if comillas % 2:
+            continue
+        cola.extend(registro)
+        registro, comillas = [], 0
+        valores = next(reader)
+        if cabecera is None:
+            cabecera = [nombre.strip() for nombre in valores]
+            continue
+        fila += 1
+        if len(valores) != len(cabecera):
+            yield fila, f"Se esperaban {len(cabecera)} columnas y hay {len(valores)}"
+            continue
+        yield fila, {campo: valor for campo, valor in zip(cabecera, valores) if valor != ""}
+    if registro and cabecera is not None:
+        yield fila + 1, "Comillas sin cerrar hasta el final del fichero"
+
+
+def iter_registros(chunks: AsyncIterator[bytes], formato: str) -> AsyncIterator[Registro]:
+    """Elegir el lector según el formato (`ndjson` o `csv`)"""
+    if formato == "csv":
+        return iter_csv(chunks)
+    return iter_ndjson(chunks)
+
+
+def _csv_value(valor: Any) -> Any:
+    """Valor de celda CSV: enums por su valor y nulos como celda vacía"""
+    if valor is None:
+        return ""
+    if isinstance(valor, enum.Enum):
+        return valor.value
+    return valor
+
+
+def json_row(fila: Mapping[str, Any]) -> dict:
+    """Fila para JSON con los Decimal (saldo) como número, igual que en los schemas"""
+    return {campo: float(valor) if isinstance(valor, Decimal) else valor for campo, valor in fila.items()}
+
+
+async def serialize_rows(
+    partitions: AsyncIterator[Sequence[Mapping[str, Any]]],
+    formato: str,
+    columnas: Sequence[str]
+) -> AsyncIterator[bytes]:
+    """Serializar bloques de filas a NDJSON o CSV, un fragmento de salida por bloque"""
+    if formato == "csv":
+        yield (",".join(columnas) + "\n").encode()
+    
+    async for filas in partitions:
+        if formato == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerows([_csv_value(fila[campo]) for campo in columnas] for fila in filas)
+            yield buffer.getvalue().encode()
+        else:
+            yield b"".join(to_json(json_row(fila)) + b"\n" for fila in filas)
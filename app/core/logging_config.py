@@ -0,0 +1,102 @@
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+
+# Atributos propios de LogRecord; el resto son campos de `extra=`
+_ATRIBUTOS_ESTANDAR = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "color_message"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Una línea JSON por registro, con los campos de `extra=` incluidos"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_ESTANDAR:
+                datos[clave] = valor
+        if record.exc_info:
+            datos["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            datos["exc_info"] = record.exc_text
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Deja pasar solo una fracción de los registros DEBUG; INFO y superiores siempre pasan"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class _QueueHandler(QueueHandler):
+    """Encola el registro con el mensaje interpolado pero sin aplicar el formato de salida"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Los argumentos se interpolan ya: podrían cambiar antes de que el listener los lea
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def iniciar_logging() -> None:
+    """Enviar los logs a una cola; un hilo aparte los formatea y los escribe"""
+    global _listener
+    if _listener is not None:
+        return
+
+    salida = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        salida.setFormatter(JSONFormatter())
+    else:
+        salida.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    cola: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(cola)
+    # El muestreo se aplica antes de encolar para no pagar el coste de los descartados
+    handler.addFilter(SamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    # Los logs de uvicorn (incluido el access log) pasan también por la cola
+    for nombre in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(nombre)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+
+
+def detener_logging() -> None:
+    """Vaciar la cola y detener el hilo de escritura"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        # Lo que se registre después (cierre de uvicorn) se escribe directamente
+        logging.getLogger().handlers = list(_listener.handlers)
+        _listener = None
@@ -0,0 +1,170 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional, Union
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Límites de los histogramas (segundos y número de consultas)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Frecuencia máxima con la que cada worker publica el estado de pools y cachés
+COLLECTOR_INTERVAL_SECONDS = 5.0
+
+
+class Registry:
+    """Métricas de prometheus_client más colectores de estado (pools, cachés) leídos en cada proceso
+
+    Con PROMETHEUS_MULTIPROC_DIR (lo fija `app.server` con varios workers) cada proceso escribe
+    sus valores en ese directorio y `/metrics` devuelve la suma de todos los workers.
+    """
+
+    def __init__(self):
+        self._colectores: list[Callable[[], Iterable[tuple[str, str, str, dict, float]]]] = []
+        # Métricas creadas para los valores de los colectores y último valor publicado de cada contador
+        self._metricas: dict[str, Union[Counter, Gauge]] = {}
+        self._publicados: dict[tuple, float] = {}
+        self._ultima_publicacion = 0.0
+
+    def add_collector(self, colector: Callable[[], Iterable[tuple[str, str, str, dict, float]]]) -> None:
+        """Colector de estado de este proceso: (nombre, tipo, ayuda, etiquetas, valor)"""
+        self._colectores.append(colector)
+
+    def _metrica(self, nombre: str, tipo: str, ayuda: str, etiquetas: tuple[str, ...]):
+        metrica = self._metricas.get(nombre)
+        if metrica is None:
+            if tipo == "counter":
+                metrica = Counter(nombre, ayuda, etiquetas)
+            else:
+                # Suma de los workers vivos (conexiones en uso, etc.)
+                metrica = Gauge(nombre, ayuda, etiquetas, multiprocess_mode="livesum")
+            self._metricas[nombre] = metrica
+        return metrica
+
+    def publicar(self, intervalo: float = 0.0) -> None:
+        """Volcar los colectores de este proceso en sus métricas, como mucho una vez por `intervalo`"""
+        ahora = time.monotonic()
+        if ahora - self._ultima_publicacion < intervalo:
+            return
+        self._ultima_publicacion = ahora
+        for colector in self._colectores:
+            for nombre, tipo, ayuda, etiquetas, valor in colector():
+                serie = self._metrica(nombre, tipo, ayuda, tuple(etiquetas)).labels(*etiquetas.values())
+                if tipo == "counter":
+                    # Los colectores dan el acumulado del proceso; el contador recibe el incremento
+                    clave = (nombre, tuple(etiquetas.values()))
+                    incremento = valor - self._publicados.get(clave, 0)
+                    if incremento > 0:
+                        serie.inc(incremento)
+                        self._publicados[clave] = valor
+                else:
+                    serie.set(valor)
+
+    def render(self) -> bytes:
+        self.publicar()
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            agregado = CollectorRegistry()
+            MultiProcessCollector(agregado)
+            return generate_latest(agregado)
+        return generate_latest(REGISTRY)
+
+
+registry = Registry()
+
+REQUESTS = Counter(
+    "http_requests_total", "Peticiones HTTP atendidas", ("method", "route", "status")
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP", ("method", "route"), buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Peticiones HTTP en curso", multiprocess_mode="livesum"
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Tiempo en base de datos por petición", ("method", "route"), buckets=LATENCY_BUCKETS
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Consultas SQL por petición", ("method", "route"), buckets=QUERY_BUCKETS
+)
+
+
+_rutas_por_app: dict[int, dict] = {}
+
+
+def plantilla_ruta(scope) -> str:
+    """Plantilla de la ruta (`/api/v1/clientes/{cliente_id}`) para no disparar la cardinalidad"""
+    app = scope.get("app")
+    rutas = _rutas_por_app.get(id(app))
+    if rutas is None:
+        rutas = _rutas_por_app[id(app)] = {
+            getattr(ruta, "endpoint", None): ruta.path for ruta in getattr(app, "routes", [])
+        }
+    return rutas.get(scope.get("endpoint"), "sin_ruta")
+
+
+class EstadisticasPeticion:
+    """Consultas y tiempo de base de datos acumulados durante una petición"""
+
+    def __init__(self, scope=None):
+        self.scope = scope or {}
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        # Lista de consultas con tiempos; solo se llena al perfilar la petición
+        self.linea_tiempo: Optional[list] = None
+
+    @property
+    def ruta(self) -> str:
+        return plantilla_ruta(self.scope)
+
+
+# Estadísticas de la petición en curso; los hooks del engine la actualizan
+peticion_actual: ContextVar[Optional[EstadisticasPeticion]] = ContextVar("peticion_actual", default=None)
+
+
+def registrar_consulta(duracion: float) -> None:
+    """Sumar una consulta SQL a la petición en curso, si la hay"""
+    estadisticas = peticion_actual.get()
+    if estadisticas is not None:
+        estadisticas.consultas += 1
+        estadisticas.tiempo_db += duracion
+
+
+class MetricasMiddleware:
+    """Middleware ASGI puro: latencia, estado, peticiones en curso y uso de base de datos por ruta"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = {"status": 500}
+
+        async def send_con_estado(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["status"] = mensaje["status"]
+            await send(mensaje)
+
+        estadisticas = EstadisticasPeticion(scope)
+        token = peticion_actual.set(estadisticas)
+        REQUESTS_IN_PROGRESS.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_estado)
+        finally:
+            duracion = time.perf_counter() - inicio
+            REQUESTS_IN_PROGRESS.dec()
+            peticion_actual.reset(token)
+
+            metodo, ruta = scope["method"], estadisticas.ruta
+            REQUESTS.labels(metodo, ruta, str(estado["status"])).inc()
+            REQUEST_LATENCY.labels(metodo, ruta).observe(duracion)
+            REQUEST_DB_TIME.labels(metodo, ruta).observe(estadisticas.tiempo_db)
+            REQUEST_DB_QUERIES.labels(metodo, ruta).observe(estadisticas.consultas)
+            # Con varios workers, el que atiende el scrape no ve el estado de los demás: cada uno lo publica
+            registry.publicar(intervalo=COLLECTOR_INTERVAL_SECONDS)
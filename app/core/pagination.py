@@ -0,0 +1,24 @@
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(last_id: int) -> str:
+    """Codificar el cursor opaco a partir del último ID entregado"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decodificar un cursor opaco; un cursor vacío indica la primera página"""
+    if not cursor:
+        return None
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Cursor de paginación inválido")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Cursor de paginación inválido")
+    return last_id
@@ -0,0 +1,96 @@
+import asyncio
+import cProfile
+import io
+import json
+import pstats
+import time
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+from app.core.config import settings
+from app.core.metricas import EstadisticasPeticion, peticion_actual
+
+# Funciones del resumen de cProfile, ordenadas por tiempo acumulado
+PROFILE_TOP = 40
+
+
+def _pide_perfil(scope) -> bool:
+    for nombre, valor in scope.get("headers", []):
+        if nombre == b"x-profile":
+            return valor.strip().lower() in (b"1", b"true")
+    return False
+
+
+class PerfilMiddleware:
+    """Con PROFILING_ENABLED, `X-Profile: 1` devuelve la línea de tiempo de consultas y un resumen de cProfile"""
+
+    def __init__(self, app):
+        self.app = app
+        # cProfile mide todo el hilo: las peticiones perfiladas se atienden de una en una
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED or not _pide_perfil(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            await self._perfilar(scope, receive, send)
+
+    async def _perfilar(self, scope, receive, send):
+        estadisticas = peticion_actual.get()
+        token = None
+        if estadisticas is None:
+            estadisticas = EstadisticasPeticion(scope)
+            token = peticion_actual.set(estadisticas)
+        estadisticas.linea_tiempo = []
+
+        respuesta = {"status": 500, "content_type": "", "body": bytearray()}
+
+        async def capturar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                respuesta["status"] = mensaje["status"]
+                cabeceras = dict(mensaje.get("headers", []))
+                respuesta["content_type"] = cabeceras.get(b"content-type", b"").decode()
+            elif mensaje["type"] == "http.response.body":
+                respuesta["body"] += mensaje.get("body", b"")
+
+        perfil = cProfile.Profile()
+        inicio = time.perf_counter()
+        perfil.enable()
+        try:
+            await self.app(scope, receive, capturar)
+        finally:
+            perfil.disable()
+            if token is not None:
+                peticion_actual.reset(token)
+        duracion = time.perf_counter() - inicio
+
+        resumen = io.StringIO()
+        pstats.Stats(perfil, stream=resumen).sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+        cuerpo = bytes(respuesta["body"])
+        if respuesta["content_type"].startswith("application/json") and cuerpo:
+            contenido = json.loads(cuerpo)
+        else:
+            contenido = cuerpo.decode(errors="replace")
+
+        informe = {
+            "status": respuesta["status"],
+            "ruta": estadisticas.ruta,
+            "duracion_ms": round(duracion * 1000, 3),
+            "consultas": len(estadisticas.linea_tiempo),
+            "tiempo_db_ms": round(sum(c["duracion_ms"] for c in estadisticas.linea_tiempo), 3),
+            "linea_tiempo": estadisticas.linea_tiempo,
+            "perfil": resumen.getvalue(),
+            "respuesta": contenido,
+        }
+        estadisticas.linea_tiempo = None
+
+        salida = Response(
+            content=to_json(informe, fallback=str),
+            media_type="application/json",
+            headers={"X-Profile-Status": str(respuesta["status"])},
+        )
+        await salida(scope, receive, send)
@@ -0,0 +1,40 @@
+from typing import Any, Iterable, Optional
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+
+class PydanticJSONResponse(Response):
+    """Respuesta JSON serializada por pydantic-core (sin jsonable_encoder ni json.dumps)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return to_json(content)
+
+
+def desde_orm(modelo: type[BaseModel], entidad: Any) -> Optional[BaseModel]:
+    """Construir el schema desde una entidad ORM sin validarla: sus datos ya se validaron al escribirse"""
+    if entidad is None:
+        return None
+    return modelo.model_construct(**{campo: getattr(entidad, campo) for campo in modelo.model_fields})
+
+
+def sin_revalidar(modelo: type[BaseModel], entidades: Iterable[Any]) -> list:
+    """Con FAST_JSON_RESPONSES, convertir filas ORM al schema de respuesta sin validación"""
+    if not settings.FAST_JSON_RESPONSES:
+        return list(entidades)
+    return [desde_orm(modelo, entidad) for entidad in entidades]
+
+
+def responder(contenido: Any, modelo: Optional[type[BaseModel]] = None, status_code: int = 200) -> Any:
+    """Con FAST_JSON_RESPONSES, serializar aquí y saltar la validación de `response_model`"""
+    if not settings.FAST_JSON_RESPONSES:
+        return contenido
+    if modelo is not None and not isinstance(contenido, modelo):
+        contenido = desde_orm(modelo, contenido)
+    return PydanticJSONResponse(contenido, status_code=status_code)
@@ -1,51 +1,209 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, insert, and_, or_, func, text, bindparam
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, List
+from pydantic import ValidationError
+from typing import Optional, List, AsyncIterator, Sequence, Mapping, Any
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+from app.core.cache import TTLCache, create_cache_backend
+from app.core.config import settings
+from app.db.database import usar_primario, lee_de_replica
 from app.models.cliente import Cliente
-from app.schemas.cliente import ClienteCreate, ClienteUpdate
+from app.core.formatos import Registro
+from app.crud.estadisticas import estadisticas_crud, Deltas, clave_resumen, saldo_de
+from app.schemas.cliente import Cliente as ClienteSchema, ClienteCreate, ClienteUpdate, ModoConteoEnum
+from app.schemas.importacion import ResultadoImportacion
+
+# Conteos recientes por combinación de filtros (modo "estimated")
+_count_cache = TTLCache(maxsize=1024, ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+# Respuestas serializadas por `id:<id>`; `email:<correo>` y `cuenta:<numero>` apuntan al ID
+cliente_cache = create_cache_backend(
+    "clientes",
+    maxsize=settings.CLIENTE_CACHE_SIZE,
+    ttl=settings.CLIENTE_CACHE_TTL_SECONDS
+)
+
+def _email_key(email: str) -> str:
+    # En minúsculas: en MySQL la búsqueda por correo no distingue mayúsculas
+    return f"email:{email.lower()}"
+
+def _cache_keys(cliente_id: int, email: Optional[str], numero_cuenta: str) -> tuple[str, ...]:
+    keys = (f"id:{cliente_id}", f"cuenta:{numero_cuenta}")
+    return keys + (_email_key(email),) if email else keys
+
+# Valores por consulta IN (...) en las búsquedas en lote
+LOOKUP_CHUNK_SIZE = 500
+
+# Parámetros por sentencia: límite de SQLite (MySQL admite 65535)
+MAX_BIND_PARAMS = 32766
+
+# Columnas con índice único y el mensaje de conflicto de cada una
+UNIQUE_FIELDS = {
+    "correo_electronico": "Ya existe un cliente con este correo electrónico",
+    "numero_cuenta": "Ya existe un cliente con este número de cuenta",
+    "numero_identificacion": "Ya existe un cliente con este número de identificación",
+}
+
+class ClienteDuplicadoError(ValueError):
+    """Violación de un índice único de clientes, con el campo en conflicto"""
+    
+    def __init__(self, campo: Optional[str] = None):
+        self.campo = campo
+        super().__init__(UNIQUE_FIELDS.get(
+            campo, "Cliente con datos únicos ya existe (email, cuenta o identificación)"
+        ))
+
+def _campo_duplicado(error: IntegrityError) -> Optional[str]:
+    """Identificar la columna única que provocó el IntegrityError"""
+    mensaje = str(error.orig)
+    # MySQL: "Duplicate entry '...' for key 'clientes.ix_clientes_correo_electronico'"
+    # SQLite: "UNIQUE constraint failed: clientes.correo_electronico"
+    key = re.search(r"for key '([^']+)'", mensaje)
+    if key:
+        mensaje = key.group(1)
+    for campo in UNIQUE_FIELDS:
+        if campo in mensaje:
+            return campo
+    return None
+
+def _patron_prefijo(valor: str) -> str:
+    """Patrón LIKE de prefijo con los comodines del texto escapados"""
+    return re.sub(r"([\\%_])", r"\\\1", valor) + "%"
 
 class ClienteCRUD:
     
     async def create(self, db: AsyncSession, cliente_data: ClienteCreate) -> Cliente:
         """Crear un nuevo cliente"""
         try:
-            logger.info("Iniciando creación en CRUD")
-            
             # Crear instancia del modelo
-            cliente_dict = cliente_data.model_dump()
-            logger.info(f"Datos del cliente: {cliente_dict}")
-            
-            cliente = Cliente(**cliente_dict)
-            logger.info("Instancia de Cliente creada")
+            cliente = Cliente(**cliente_data.model_dump())
             
             db.add(cliente)
-            logger.info("Cliente agregado a sesión")
             
-            await db.commit()
-            logger.info("Commit exitoso")
+            # El resumen por grupos se actualiza en la misma transacción
+            deltas = Deltas()
+            deltas.sumar(clave_resumen(cliente), 1, saldo_de(cliente))
+            await estadisticas_crud.aplicar(db, deltas)
             
-            await db.refresh(cliente)
-            logger.info(f"Cliente refrescado, ID: {cliente.id}")
+            # Un solo INSERT: la unicidad la garantizan los índices únicos
+            await db.commit()
+            logger.debug("Commit exitoso, ID: %s", cliente.id)
             
             return cliente
             
         except IntegrityError as e:
-            logger.error(f"IntegrityError: {str(e)}")
             await db.rollback()
-            raise ValueError("Cliente con datos únicos ya existe (email, cuenta o identificación)")
+            campo = _campo_duplicado(e)
+            logger.debug("Cliente duplicado (%s)", campo)
+            raise ClienteDuplicadoError(campo)
         except Exception as e:
-            logger.error(f"Error inesperado en create: {str(e)}", exc_info=True)
+            logger.error("Error inesperado en create: %s", e, exc_info=True)
             await db.rollback()
             raise
     
-    async def get_by_id(self, db: AsyncSession, cliente_id: int) -> Optional[Cliente]:
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        registros: AsyncIterator[Registro],
+        batch_size: int = 1000
+    ) -> ResultadoImportacion:
+        """Importar clientes en lotes: validación, INSERT multi-fila y un commit por lote"""
+        # Un INSERT multi-fila usa un parámetro por celda y SQLite admite MAX_BIND_PARAMS por sentencia
+        batch_size = min(batch_size, MAX_BIND_PARAMS // len(ClienteCreate.model_fields))
+        resultado = ResultadoImportacion()
+        lote: list[tuple[int, dict]] = []
+        
+        async for fila, datos in registros:
+            resultado.total += 1
+            if isinstance(datos, str):
+                resultado.agregar_error(fila, datos)
+                continue
+            try:
+                cliente = ClienteCreate.model_validate(datos)
+            except ValidationError as e:
+                resultado.agregar_error(fila, "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+            
+            lote.append((fila, cliente.model_dump()))
+            if len(lote) >= batch_size:
+                await self._insert_batch(db, lote, resultado)
+                lote = []
+        
+        if lote:
+            await self._insert_batch(db, lote, resultado)
+        
+        return resultado
+    
+    async def _insert_batch(
+        self,
+        db: AsyncSession,
+        lote: list[tuple[int, dict]],
+        resultado: ResultadoImportacion
+    ) -> None:
+        """Insertar un lote descartando antes los duplicados con una sola consulta"""
+        # Valores únicos ya existentes en la BD para este lote
+        query = select(
+            Cliente.correo_electronico, Cliente.numero_cuenta, Cliente.numero_identificacion
+        ).where(or_(*(
+            getattr(Cliente, campo).in_({datos[campo] for _, datos in lote})
+            for campo in UNIQUE_FIELDS
+        )))
+        existentes = {campo: set() for campo in UNIQUE_FIELDS}
+        for row in (await db.execute(query)).all():
+            for campo in UNIQUE_FIELDS:
+                existentes[campo].add(getattr(row, campo))
+        
+        filas = []
+        for fila, datos in lote:
+            campo = next((c for c in UNIQUE_FIELDS if datos[c] in existentes[c]), None)
+            if campo:
+                resultado.agregar_error(fila, UNIQUE_FIELDS[campo])
+                continue
+            # Los duplicados dentro del mismo fichero también se descartan
+            for c in UNIQUE_FIELDS:
+                existentes[c].add(datos[c])
+            filas.append((fila, datos))
+        
+        if not filas:
+            return
+        
+        try:
+            await db.execute(insert(Cliente).values([datos for _, datos in filas]))
+            deltas = Deltas()
+            for _, datos in filas:
+                deltas.sumar(clave_resumen(datos), 1, saldo_de(datos))
+            await estadisticas_crud.aplicar(db, deltas)
+            await db.commit()
+            resultado.insertados += len(filas)
+        except IntegrityError:
+            # Conflicto concurrente: se reintenta fila a fila para aislarlo
+            await db.rollback()
+            for fila, datos in filas:
+                try:
+                    await db.execute(insert(Cliente).values(datos))
+                    deltas = Deltas()
+                    deltas.sumar(clave_resumen(datos), 1, saldo_de(datos))
+                    await estadisticas_crud.aplicar(db, deltas)
+                    await db.commit()
+                    resultado.insertados += 1
+                except IntegrityError as e:
+                    await db.rollback()
+                    resultado.agregar_error(fila, str(ClienteDuplicadoError(_campo_duplicado(e))))
+    
+    async def get_by_id(self, db: AsyncSession, cliente_id: int, for_update: bool = False) -> Optional[Cliente]:
         """Obtener cliente por ID"""
-        result = await db.execute(select(Cliente).where(Cliente.id == cliente_id))
+        query = select(Cliente).where(Cliente.id == cliente_id)
+        if for_update:
+            # Bloquea la fila hasta el commit y relee sus valores aunque ya estuviera en la sesión
+            query = query.with_for_update().execution_options(populate_existing=True)
+        result = await db.execute(query)
         return result.scalar_one_or_none()
     
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[Cliente]:
@@ -58,41 +216,317 @@ class ClienteCRUD:
         result = await db.execute(select(Cliente).where(Cliente.numero_cuenta == numero_cuenta))
         return result.scalar_one_or_none()
     
+    async def _get_many_by(
+        self,
+        db: AsyncSession,
+        column,
+        values: Sequence[Any],
+        normalize=None
+    ) -> List[Optional[Cliente]]:
+        """Resolver muchos valores con un IN (...) por bloque, en el orden de entrada"""
+        normalize = normalize or (lambda valor: valor)
+        unicos = list(dict.fromkeys(values))
+        encontrados = {}
+        for inicio in range(0, len(unicos), LOOKUP_CHUNK_SIZE):
+            bloque = unicos[inicio:inicio + LOOKUP_CHUNK_SIZE]
+            result = await db.execute(select(Cliente).where(column.in_(bloque)))
+            for cliente in result.scalars():
+                encontrados[normalize(getattr(cliente, column.key))] = cliente
+        return [encontrados.get(normalize(valor)) for valor in values]
+    
+    async def get_many_by_ids(self, db: AsyncSession, ids: Sequence[int]) -> List[Optional[Cliente]]:
+        """Obtener varios clientes por ID; None para los que no existen"""
+        return await self._get_many_by(db, Cliente.id, ids)
+    
+    async def get_many_by_emails(self, db: AsyncSession, emails: Sequence[str]) -> List[Optional[Cliente]]:
+        """Obtener varios clientes por email; None para los que no existen"""
+        # La comparación en MySQL no distingue mayúsculas
+        return await self._get_many_by(db, Cliente.correo_electronico, emails, normalize=str.lower)
+    
+    async def get_many_by_numeros_cuenta(
+        self,
+        db: AsyncSession,
+        numeros_cuenta: Sequence[str]
+    ) -> List[Optional[Cliente]]:
+        """Obtener varios clientes por número de cuenta; None para los que no existen"""
+        return await self._get_many_by(db, Cliente.numero_cuenta, numeros_cuenta)
+    
+    async def _cache_cliente(self, schema: ClienteSchema, token: int, from_replica: bool) -> bool:
+        """Guardar la respuesta serializada y sus claves secundarias si no se invalidaron desde `token`"""
+        key_id, *secundarias = _cache_keys(schema.id, schema.correo_electronico, schema.numero_cuenta)
+        items = {key_id: schema.model_dump_json()}
+        items.update((key, str(schema.id)) for key in secundarias)
+        return await cliente_cache.set_if_valid(items, token, from_replica)
+    
+    async def _load_into_cache(self, db: AsyncSession, key: str, getter, valor: Any) -> Optional[ClienteSchema]:
+        """Leer un cliente que no está en la caché y guardarlo"""
+        # Los fallos se leen de la réplica de la sesión; solo un cliente modificado hace menos
+        # de un TTL va al primario, porque una réplica con retraso aún tendría la versión anterior
+        if await cliente_cache.recently_invalidated(key):
+            usar_primario(db)
+        from_replica = lee_de_replica(db)
+        # Sello antes de leer: si un commit invalida el cliente mientras tanto, no se guarda
+        token = await cliente_cache.fill_token()
+        cliente = await getter(db, valor)
+        if cliente is None:
+            return None
+        schema = ClienteSchema.model_validate(cliente)
+        await self._cache_cliente(schema, token, from_replica)
+        return schema
+    
+    async def _get_cached_id(self, cliente_id: int) -> Optional[ClienteSchema]:
+        cached = await cliente_cache.get(f"id:{cliente_id}")
+        if cached is None:
+            return None
+        return ClienteSchema.model_validate_json(cached)
+    
+    async def get_cached(self, db: AsyncSession, cliente_id: int) -> Optional[ClienteSchema]:
+        """Obtener cliente por ID, primero desde la caché"""
+        schema = await self._get_cached_id(cliente_id)
+        if schema is not None:
+            return schema
+        
+        return await self._load_into_cache(db, f"id:{cliente_id}", self.get_by_id, cliente_id)
+    
+    async def _get_cached_by(self, key: str, coincide) -> Optional[ClienteSchema]:
+        """Resolver una clave secundaria y comprobar que sigue apuntando al mismo valor"""
+        cliente_id = await cliente_cache.get(key)
+        if cliente_id is None:
+            return None
+        schema = await self._get_cached_id(int(cliente_id))
+        # El ID puede haber cambiado de correo/cuenta desde que se guardó la clave
+        if schema is None or not coincide(schema):
+            return None
+        return schema
+    
+    async def get_cached_by_email(self, db: AsyncSession, email: str) -> Optional[ClienteSchema]:
+        """Obtener cliente por email, primero desde la caché"""
+        schema = await self._get_cached_by(
+            _email_key(email),
+            lambda cliente: cliente.correo_electronico is not None and cliente.correo_electronico.lower() == email.lower()
+        )
+        if schema is not None:
+            return schema
+        
+        return await self._load_into_cache(db, _email_key(email), self.get_by_email, email)
+    
+    async def get_cached_by_numero_cuenta(self, db: AsyncSession, numero_cuenta: str) -> Optional[ClienteSchema]:
+        """Obtener cliente por número de cuenta, primero desde la caché"""
+        schema = await self._get_cached_by(
+            f"cuenta:{numero_cuenta}",
+            lambda cliente: cliente.numero_cuenta == numero_cuenta
+        )
+        if schema is not None:
+            return schema
+        
+        return await self._load_into_cache(db, f"cuenta:{numero_cuenta}", self.get_by_numero_cuenta, numero_cuenta)
+    
+    async def warm_cache(self, db: AsyncSession, limite: int, chunk_size: int = 1000) -> int:
+        """Cargar en la caché los `limite` clientes más recientes; devuelve cuántos se guardaron"""
+        # Desde una réplica no se guardan los clientes modificados hace menos de un TTL
+        from_replica = lee_de_replica(db)
+        token = await cliente_cache.fill_token()
+        result = await db.stream_scalars(
+            select(Cliente).order_by(Cliente.id.desc()).limit(limite).execution_options(yield_per=chunk_size)
+        )
+        total = 0
+        async for cliente in result:
+            total += await self._cache_cliente(ClienteSchema.model_validate(cliente), token, from_replica)
+        return total
+    
+    def _search_terms(self, q: Optional[str]) -> list[str]:
+        """Extraer las palabras de una búsqueda, sin operadores de FULLTEXT"""
+        return re.findall(r"\w+", q or "")
+    
+    def _search_match(self, terms: list[str]):
+        """Expresión MATCH ... AGAINST sobre el índice FULLTEXT de nombre y apellido"""
+        # Todas las palabras son obligatorias y se buscan como prefijo
+        against = " ".join(f"+{term}*" for term in terms)
+        # Bind con nombre propio para ocultarlo en el log de consultas lentas
+        return match(Cliente.nombre, Cliente.apellido, against=bindparam("busqueda", against, unique=True)).in_boolean_mode()
+    
+    def _build_filters(
+        self,
+        db: AsyncSession,
+        nombre: Optional[str] = None,
+        tipo_cliente: Optional[str] = None,
+        q: Optional[str] = None,
+        nombre_prefijo: Optional[str] = None
+    ) -> list:
+        """Construir los filtros comunes de los listados"""
+        filters = []
+        if nombre:
+            filters.append(Cliente.nombre.ilike(f"%{nombre}%"))
+        if nombre_prefijo:
+            # Prefijo sin comodín inicial para que pueda usar ix_clientes_nombre
+            patron = _patron_prefijo(nombre_prefijo)
+            if db.get_bind().dialect.name == "mysql":
+                # La colación de MySQL ya ignora mayúsculas; ILIKE (lower()) anularía el índice
+                filters.append(Cliente.nombre.like(patron, escape="\\"))
+            else:
+                filters.append(Cliente.nombre.ilike(patron, escape="\\"))
+        if tipo_cliente:
+            filters.append(Cliente.tipo_cliente == tipo_cliente)
+        
+        terms = self._search_terms(q)
+        if terms:
+            if db.get_bind().dialect.name == "mysql":
+                filters.append(self._search_match(terms))
+            else:
+                # Sin FULLTEXT (p. ej. SQLite en desarrollo) se recurre a ILIKE
+                for term in terms:
+                    filters.append(or_(
+                        Cliente.nombre.ilike(f"%{term}%"),
+                        Cliente.apellido.ilike(f"%{term}%")
+                    ))
+        return filters
+    
+    async def count(
+        self,
+        db: AsyncSession,
+        nombre: Optional[str] = None,
+        tipo_cliente: Optional[str] = None,
+        modo: ModoConteoEnum = ModoConteoEnum.EXACT,
+        q: Optional[str] = None,
+        nombre_prefijo: Optional[str] = None
+    ) -> Optional[int]:
+        """Contar clientes según el modo: exacto, estimado u omitido"""
+        if modo == ModoConteoEnum.NONE:
+            return None
+        
+        if modo == ModoConteoEnum.ESTIMATED:
+            if not nombre and not tipo_cliente and not q and not nombre_prefijo:
+                estimado = await self._estimate_table_rows(db)
+                if estimado is not None:
+                    return estimado
+            
+            # Con filtros se reutiliza un conteo exacto reciente
+            key = (nombre, tipo_cliente, q, nombre_prefijo)
+            total = _count_cache.get(key)
+            if total is None:
+                total = await self.count(db, nombre, tipo_cliente, q=q, nombre_prefijo=nombre_prefijo)
+                _count_cache.set(key, total)
+            return total
+        
+        count_query = select(func.count(Cliente.id))
+        filters = self._build_filters(db, nombre, tipo_cliente, q, nombre_prefijo)
+        if filters:
+            count_query = count_query.where(and_(*filters))
+        
+        total_result = await db.execute(count_query)
+        return total_result.scalar()
+    
+    async def _estimate_table_rows(self, db: AsyncSession) -> Optional[int]:
+        """Leer el número de filas aproximado de las estadísticas de MySQL"""
+        if db.get_bind().dialect.name != "mysql":
+            return None
+        
+        result = await db.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla"
+            ),
+            {"tabla": Cliente.__tablename__}
+        )
+        return result.scalar()
+    
+    def _select_columnas(self, columnas: Optional[Sequence[str]]):
+        """SELECT de la entidad completa o solo de las columnas pedidas"""
+        if not columnas:
+            return select(Cliente)
+        return select(*(Cliente.__table__.c[columna] for columna in columnas))
+    
+    def _filas(self, result, columnas: Optional[Sequence[str]]) -> list:
+        """Entidades ORM o, en una proyección, filas como mappings sin hidratar"""
+        if not columnas:
+            return list(result.scalars().all())
+        return list(result.mappings().all())
+    
     async def get_all(
         self, 
         db: AsyncSession, 
         skip: int = 0, 
         limit: int = 100,
         nombre: Optional[str] = None,
-        tipo_cliente: Optional[str] = None
-    ) -> tuple[List[Cliente], int]:
+        tipo_cliente: Optional[str] = None,
+        conteo: ModoConteoEnum = ModoConteoEnum.EXACT,
+        q: Optional[str] = None,
+        columnas: Optional[Sequence[str]] = None,
+        nombre_prefijo: Optional[str] = None
+    ) -> tuple[Sequence[Any], Optional[int]]:
         """Obtener todos los clientes con paginación y filtros"""
-        query = select(Cliente)
+        query = self._select_columnas(columnas)
         
         # Aplicar filtros
-        filters = []
-        if nombre:
-            filters.append(Cliente.nombre.ilike(f"%{nombre}%"))
-        if tipo_cliente:
-            filters.append(Cliente.tipo_cliente == tipo_cliente)
+        filters = self._build_filters(db, nombre, tipo_cliente, q, nombre_prefijo)
         
         if filters:
             query = query.where(and_(*filters))
         
-        # Contar total primero - CORREGIDO
-        count_query = select(func.count(Cliente.id))
-        if filters:
-            count_query = count_query.where(and_(*filters))
+        # Contar total primero (puede ser estimado u omitirse)
+        total = await self.count(db, nombre, tipo_cliente, conteo, q, nombre_prefijo)
         
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
+        # Con búsqueda por texto se ordena por relevancia
+        terms = self._search_terms(q)
+        if terms and db.get_bind().dialect.name == "mysql":
+            query = query.order_by(self._search_match(terms).desc())
+        
+        # Obtener resultados con paginación (orden estable por ID)
+        query = query.order_by(Cliente.id).offset(skip).limit(limit)
+        result = await db.execute(query)
+        clientes = self._filas(result, columnas)
+        
+        return clientes, total
+    
+    async def get_page_after(
+        self,
+        db: AsyncSession,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        nombre: Optional[str] = None,
+        tipo_cliente: Optional[str] = None,
+        q: Optional[str] = None,
+        columnas: Optional[Sequence[str]] = None,
+        nombre_prefijo: Optional[str] = None
+    ) -> tuple[Sequence[Any], bool]:
+        """Obtener una página de clientes por cursor (keyset) sobre el ID"""
+        filters = self._build_filters(db, nombre, tipo_cliente, q, nombre_prefijo)
+        if after_id is not None:
+            filters.append(Cliente.id > after_id)
+        
+        query = self._select_columnas(columnas)
+        if filters:
+            query = query.where(and_(*filters))
         
-        # Obtener resultados con paginación
-        query = query.offset(skip).limit(limit)
+        # Se pide un registro extra para saber si existe una página siguiente
+        query = query.order_by(Cliente.id).limit(limit + 1)
         result = await db.execute(query)
-        clientes = result.scalars().all()
+        clientes = self._filas(result, columnas)
         
-        return list(clientes), total
+        has_more = len(clientes) > limit
+        return clientes[:limit], has_more
+    
+    async def stream_rows(
+        self,
+        db: AsyncSession,
+        nombre: Optional[str] = None,
+        tipo_cliente: Optional[str] = None,
+        q: Optional[str] = None,
+        chunk_size: int = 1000,
+        nombre_prefijo: Optional[str] = None
+    ) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        """Recorrer todos los clientes con un cursor de servidor, en bloques de filas"""
+        query = select(*Cliente.__table__.columns)
+        filters = self._build_filters(db, nombre, tipo_cliente, q, nombre_prefijo)
+        if filters:
+            query = query.where(and_(*filters))
+        
+        # Filas planas (sin entidades ORM) para mantener la memoria constante
+        result = await db.stream(
+            query.order_by(Cliente.id).execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.mappings().partitions():
+            yield partition
     
     async def update(
         self, 
@@ -101,30 +535,49 @@ class ClienteCRUD:
         cliente_update: ClienteUpdate
     ) -> Optional[Cliente]:
         """Actualizar cliente"""
-        cliente = await self.get_by_id(db, cliente_id)
+        # Con la fila bloqueada, dos actualizaciones concurrentes no restan el mismo grupo anterior
+        cliente = await self.get_by_id(db, cliente_id, for_update=True)
         if not cliente:
             return None
         
+        # Claves con el correo y la cuenta anteriores al cambio
+        stale_keys = _cache_keys(cliente.id, cliente.correo_electronico, cliente.numero_cuenta)
+        # El cliente sale de su grupo anterior y entra en el nuevo (puede ser el mismo)
+        deltas = Deltas()
+        deltas.sumar(clave_resumen(cliente), -1, -saldo_de(cliente))
+        
         update_data = cliente_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(cliente, field, value)
         
+        deltas.sumar(clave_resumen(cliente), 1, saldo_de(cliente))
+        
         try:
+            # El upsert del resumen hace flush antes: un duplicado puede saltar aquí
+            await estadisticas_crud.aplicar(db, deltas)
             await db.commit()
-            await db.refresh(cliente)
-            return cliente
-        except IntegrityError:
+        except IntegrityError as e:
             await db.rollback()
-            raise ValueError("Datos únicos ya existen (email, cuenta o identificación)")
+            raise ClienteDuplicadoError(_campo_duplicado(e))
+        
+        await cliente_cache.delete(*stale_keys)
+        return cliente
     
     async def delete(self, db: AsyncSession, cliente_id: int) -> bool:
         """Eliminar cliente"""
-        cliente = await self.get_by_id(db, cliente_id)
+        # Un segundo DELETE concurrente espera al primero y ya no encuentra la fila
+        cliente = await self.get_by_id(db, cliente_id, for_update=True)
         if not cliente:
             return False
         
+        stale_keys = _cache_keys(cliente.id, cliente.correo_electronico, cliente.numero_cuenta)
+        deltas = Deltas()
+        deltas.sumar(clave_resumen(cliente), -1, -saldo_de(cliente))
         await db.delete(cliente)
+        await estadisticas_crud.aplicar(db, deltas)
         await db.commit()
+        
+        await cliente_cache.delete(*stale_keys)
         return True
 
 # Instancia global del CRUD
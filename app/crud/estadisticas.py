@@ -0,0 +1,175 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, func, case, extract, literal, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from typing import Optional, Sequence, Mapping, Any
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+import logging
+
+logger = logging.getLogger(__name__)
+
+from app.models.cliente import Cliente, ClienteResumen
+
+# Clave de grupo del resumen: (tipo_cliente, nacionalidad, genero, anio_nacimiento)
+ClaveResumen = tuple[str, str, str, int]
+
+# Dimensiones por las que se puede agrupar
+DIMENSIONES = ("tipo_cliente", "nacionalidad", "genero", "rango_edad")
+
+# Límite inferior de edad de cada rango, de mayor a menor
+RANGOS_EDAD = ((65, "65+"), (55, "55-64"), (45, "45-54"), (35, "35-44"), (25, "25-34"), (0, "18-24"))
+
+_COLUMNAS_CLAVE = ("tipo_cliente", "nacionalidad", "genero", "anio_nacimiento")
+
+
+def _texto(valor: Any) -> str:
+    """Valor de una dimensión en el resumen: valor del enum, texto o "" si es NULL"""
+    return getattr(valor, "value", valor) or ""
+
+
+def clave_resumen(datos: Any) -> ClaveResumen:
+    """Grupo al que pertenece un cliente (entidad ORM o dict)"""
+    get = datos.get if isinstance(datos, Mapping) else lambda campo: getattr(datos, campo)
+    return (
+        _texto(get("tipo_cliente")),
+        _texto(get("nacionalidad")),
+        _texto(get("genero")),
+        get("fecha_nacimiento").year,
+    )
+
+
+def saldo_de(datos: Any) -> Decimal:
+    saldo = datos.get("saldo") if isinstance(datos, Mapping) else datos.saldo
+    return Decimal(saldo or 0)
+
+
+class Deltas:
+    """Variaciones de conteo y saldo por grupo, acumuladas antes de aplicarlas"""
+
+    def __init__(self):
+        self._grupos: dict[ClaveResumen, list] = defaultdict(lambda: [0, Decimal(0)])
+
+    def sumar(self, clave: ClaveResumen, clientes: int, saldo: Decimal) -> None:
+        grupo = self._grupos[clave]
+        grupo[0] += clientes
+        grupo[1] += saldo
+
+    def filas(self) -> list[dict]:
+        # Orden fijo: transacciones que tocan los mismos grupos los bloquean en el mismo orden
+        return [
+            {**dict(zip(_COLUMNAS_CLAVE, clave)), "clientes": clientes, "saldo_total": saldo}
+            for clave, (clientes, saldo) in sorted(self._grupos.items())
+            if clientes or saldo
+        ]
+
+
+class EstadisticasCRUD:
+
+    def _upsert(self, dialecto: str, filas: list[dict]):
+        """INSERT que suma a la fila existente del grupo, según el dialecto"""
+        tabla = ClienteResumen.__table__
+        if dialecto == "mysql":
+            stmt = mysql.insert(tabla).values(filas)
+            return stmt.on_duplicate_key_update(
+                clientes=tabla.c.clientes + stmt.inserted.clientes,
+                saldo_total=tabla.c.saldo_total + stmt.inserted.saldo_total,
+            )
+        dialectos = {"postgresql": postgresql, "sqlite": sqlite}
+        if dialecto not in dialectos:
+            raise NotImplementedError(f"Resumen de clientes no soportado en {dialecto}")
+        stmt = dialectos[dialecto].insert(tabla).values(filas)
+        return stmt.on_conflict_do_update(
+            index_elements=list(_COLUMNAS_CLAVE),
+            set_={
+                "clientes": tabla.c.clientes + stmt.excluded.clientes,
+                "saldo_total": tabla.c.saldo_total + stmt.excluded.saldo_total,
+            },
+        )
+
+    async def aplicar(self, db: AsyncSession, deltas: Deltas) -> None:
+        """Aplicar las variaciones en la transacción en curso (el commit lo hace quien llama)"""
+        filas = deltas.filas()
+        if filas:
+            await db.execute(self._upsert(db.get_bind().dialect.name, filas))
+
+    async def reconstruir(self, db: AsyncSession) -> int:
+        """Recalcular el resumen completo desde la tabla de clientes; devuelve el número de grupos"""
+        dialecto = db.get_bind().dialect.name
+        # Cada escritura de clientes aplica su delta al resumen en su propia transacción:
+        # bloqueando el resumen antes de contar, una escritura concurrente o ya está en el
+        # recuento o espera al commit de la reconstrucción y aplica su delta después
+        if dialecto == "postgresql":
+            await db.execute(text("LOCK TABLE clientes_resumen IN SHARE ROW EXCLUSIVE MODE"))
+        # En MySQL el DELETE bloquea todas las filas y huecos (next-key) y en SQLite toma el
+        # bloqueo de escritura de la base
+        await db.execute(delete(ClienteResumen))
+
+        anio = extract("year", Cliente.fecha_nacimiento)
+        query = select(
+            Cliente.tipo_cliente, Cliente.nacionalidad, Cliente.genero, anio,
+            func.count(), func.coalesce(func.sum(Cliente.saldo), 0)
+        ).group_by(Cliente.tipo_cliente, Cliente.nacionalidad, Cliente.genero, anio)
+        if dialecto == "mysql":
+            # Lectura bloqueante: cuenta lo último confirmado y no la instantánea de la transacción
+            query = query.with_for_update(read=True)
+
+        deltas = Deltas()
+        for tipo, nacionalidad, genero, anio_nacimiento, clientes, saldo in (await db.execute(query)).all():
+            clave = (_texto(tipo), _texto(nacionalidad), _texto(genero), int(anio_nacimiento))
+            deltas.sumar(clave, clientes, Decimal(saldo))
+
+        filas = deltas.filas()
+        if filas:
+            await db.execute(insert(ClienteResumen), filas)
+        await db.commit()
+        logger.info("Resumen de clientes reconstruido: %d grupos", len(filas))
+        return len(filas)
+
+    def _rango_edad(self, hoy: date):
+        """Rango de edad calculado desde el año de nacimiento (edad cumplida en el año en curso)"""
+        anio = ClienteResumen.anio_nacimiento
+        return case(
+            *((anio <= hoy.year - minimo, etiqueta) for minimo, etiqueta in RANGOS_EDAD[:-1]),
+            else_=literal(RANGOS_EDAD[-1][1])
+        )
+
+    async def saldos(
+        self,
+        db: AsyncSession,
+        agrupar_por: Sequence[str],
+        tipo_cliente: Optional[str] = None
+    ) -> list[dict]:
+        """Conteo, saldo total y promedio por grupo; el GROUP BY recorre solo el resumen"""
+        columnas = {
+            "tipo_cliente": ClienteResumen.tipo_cliente,
+            "nacionalidad": ClienteResumen.nacionalidad,
+            "genero": ClienteResumen.genero,
+            "rango_edad": self._rango_edad(date.today()),
+        }
+        dimensiones = [columnas[d].label(d) for d in agrupar_por]
+        clientes = func.sum(ClienteResumen.clientes)
+        query = (
+            select(*dimensiones, clientes.label("clientes"), func.sum(ClienteResumen.saldo_total).label("saldo_total"))
+            .having(clientes > 0)
+        )
+        if dimensiones:
+            query = query.group_by(*dimensiones).order_by(*dimensiones)
+        if tipo_cliente:
+            query = query.where(ClienteResumen.tipo_cliente == tipo_cliente)
+
+        grupos = []
+        for row in (await db.execute(query)).mappings():
+            grupo = {d: row[d] or None for d in agrupar_por}
+            total = Decimal(row["saldo_total"] or 0)
+            grupo.update(
+                clientes=row["clientes"],
+                saldo_total=total.quantize(Decimal("0.01")),
+                saldo_promedio=(total / row["clientes"]).quantize(Decimal("0.01")),
+            )
+            grupos.append(grupo)
+        return grupos
+
+
+# Instancia global del CRUD
+estadisticas_crud = EstadisticasCRUD()
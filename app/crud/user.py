@@ -0,0 +1,189 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, or_, func, bindparam
+from sqlalchemy.exc import IntegrityError, DataError
+from pydantic import ValidationError
+from concurrent.futures import Executor
+from typing import Optional, AsyncIterator
+import asyncio
+
+from app.core.auth import hash_passwords
+from app.core.cache import create_cache_backend
+from app.core.config import settings
+from app.core.formatos import Registro
+from app.models.user import User
+from app.schemas.importacion import ResultadoImportacion
+from app.schemas.user import User as UserSchema, UserBulkCreate, UserFlagsUpdate
+
+# Principales autenticados por username (evita un SELECT por petición). En memoria solo con
+# un proceso: con varios workers el servidor exige CACHE_URL para que la invalidación llegue a todos
+user_cache = create_cache_backend(
+    "usuarios",
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+class UserCRUD:
+    
+    async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
+        """Obtener usuario por username"""
+        result = await db.execute(select(User).where(User.username == username))
+        return result.scalar_one_or_none()
+    
+    async def get_principal(self, db: AsyncSession, username: str) -> Optional[UserSchema]:
+        """Obtener el usuario autenticado, primero desde la caché"""
+        cached = await user_cache.get(username)
+        if cached is not None:
+            return UserSchema.model_validate_json(cached)
+        
+        # Si update_flags invalida al usuario durante la lectura, no se guarda la versión anterior
+        token = await user_cache.fill_token()
+        user = await self.get_by_username(db, username)
+        if user is None:
+            return None
+        
+        principal = UserSchema.model_validate(user)
+        await user_cache.set_if_valid({username: principal.model_dump_json()}, token)
+        return principal
+    
+    async def update_flags(
+        self,
+        db: AsyncSession,
+        username: str,
+        flags: UserFlagsUpdate
+    ) -> Optional[User]:
+        """Activar/desactivar o cambiar el rol de admin e invalidar la caché"""
+        user = await self.get_by_username(db, username)
+        if not user:
+            return None
+        
+        for field, value in flags.model_dump(exclude_unset=True).items():
+            setattr(user, field, value)
+        
+        await db.commit()
+        await db.refresh(user)
+        
+        # Las comprobaciones de is_active/is_admin deben ver el cambio de inmediato
+        await user_cache.delete(username)
+        return user
+
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        registros: AsyncIterator[Registro],
+        hash_executor: Executor,
+        hash_workers: int,
+        batch_size: int = 500
+    ) -> ResultadoImportacion:
+        """Crear usuarios en lotes: validación, bcrypt en paralelo, INSERT multi-fila y un commit por lote"""
+        resultado = ResultadoImportacion()
+        lote: list[tuple[int, UserBulkCreate]] = []
+        
+        async for fila, datos in registros:
+            resultado.total += 1
+            if isinstance(datos, str):
+                resultado.agregar_error(fila, datos)
+                continue
+            try:
+                usuario = UserBulkCreate.model_validate(datos)
+            except ValidationError as e:
+                resultado.agregar_error(fila, "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+            
+            lote.append((fila, usuario))
+            if len(lote) >= batch_size:
+                await self._insert_batch(db, lote, resultado, hash_executor, hash_workers)
+                lote = []
+        
+        if lote:
+            await self._insert_batch(db, lote, resultado, hash_executor, hash_workers)
+        
+        return resultado
+    
+    async def _hash_batch(self, passwords: list[str], hash_executor: Executor, hash_workers: int) -> list[str]:
+        """Repartir los hashes de un lote en bloques, uno por proceso"""
+        loop = asyncio.get_running_loop()
+        tamano = -(-len(passwords) // hash_workers)
+        bloques = [passwords[i:i + tamano] for i in range(0, len(passwords), tamano)]
+        hashes = await asyncio.gather(*(
+            loop.run_in_executor(hash_executor, hash_passwords, bloque) for bloque in bloques
+        ))
+        return [h for bloque in hashes for h in bloque]
+    
+    async def _insert_batch(
+        self,
+        db: AsyncSession,
+        lote: list[tuple[int, UserBulkCreate]],
+        resultado: ResultadoImportacion,
+        hash_executor: Executor,
+        hash_workers: int
+    ) -> None:
+        """Insertar un lote descartando antes los duplicados con una sola consulta"""
+        # username y email únicos; se comparan sin mayúsculas, como la colación de MySQL.
+        # lower() en los dos lados: en SQLite o PostgreSQL IN distingue mayúsculas.
+        # Binds con nombre propio para ocultarlos en el log de consultas lentas
+        query = select(func.lower(User.username), func.lower(User.email)).where(or_(
+            func.lower(User.username).in_(bindparam("username", expanding=True)),
+            func.lower(User.email).in_(bindparam("email", expanding=True))
+        ))
+        parametros = {
+            "username": list({usuario.username.lower() for _, usuario in lote}),
+            "email": list({usuario.email.lower() for _, usuario in lote}),
+        }
+        usernames, emails = set(), set()
+        for username, email in (await db.execute(query, parametros)).all():
+            usernames.add(username)
+            emails.add(email)
+        
+        nuevos = []
+        for fila, usuario in lote:
+            username, email = usuario.username.lower(), usuario.email.lower()
+            if username in usernames:
+                resultado.agregar_error(fila, "Ya existe un usuario con este username")
+                continue
+            if email in emails:
+                resultado.agregar_error(fila, "Ya existe un usuario con este email")
+                continue
+            # Los duplicados dentro del mismo fichero también se descartan
+            usernames.add(username)
+            emails.add(email)
+            nuevos.append((fila, usuario))
+        
+        if not nuevos:
+            return
+        
+        # bcrypt solo para las filas que se van a insertar
+        hashes = await self._hash_batch([usuario.password for _, usuario in nuevos], hash_executor, hash_workers)
+        filas = [
+            (fila, {
+                "username": usuario.username,
+                "email": usuario.email,
+                "hashed_password": hashed,
+                "is_active": usuario.is_active,
+                "is_admin": usuario.is_admin,
+            })
+            for (fila, usuario), hashed in zip(nuevos, hashes)
+        ]
+        
+        try:
+            await db.execute(insert(User).values([datos for _, datos in filas]))
+            await db.commit()
+            resultado.insertados += len(filas)
+        except (IntegrityError, DataError):
+            # Conflicto concurrente o valor que la columna no admite: se reintenta fila a fila para aislarlo
+            await db.rollback()
+            for fila, datos in filas:
+                try:
+                    await db.execute(insert(User).values(datos))
+                    await db.commit()
+                    resultado.insertados += 1
+                except IntegrityError:
+                    await db.rollback()
+                    resultado.agregar_error(fila, "Ya existe un usuario con este username o email")
+                except DataError:
+                    await db.rollback()
+                    resultado.agregar_error(fila, "Valor no admitido por la base de datos")
+
+# Instancia global del CRUD
+user_crud = UserCRUD()
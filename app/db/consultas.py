@@ -0,0 +1,88 @@
+import logging
+import re
+import time
+from typing import Any
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metricas import peticion_actual, registrar_consulta
+from app.models.cliente import Cliente
+
+logger = logging.getLogger(__name__)
+
+# Columnas de Cliente sin datos personales; el resto de parámetros se ocultan en los logs
+_CAMPOS_PUBLICOS = {"id", "tipo_cliente", "created_at", "updated_at"}
+CAMPOS_SENSIBLES = frozenset(
+    {column.name for column in Cliente.__table__.columns} - _CAMPOS_PUBLICOS
+    | {"busqueda", "username", "email", "hashed_password"}
+)
+
+
+def _campo(bind_name: str) -> str:
+    # `correo_electronico_1`, `id_1_2` (IN expandido), `email_m3` (INSERT multi-fila) -> nombre de la columna
+    return re.sub(r"(_m?\d+)+$", "", bind_name)
+
+
+def _sensible(bind_name: str, valor: Any) -> bool:
+    campo = _campo(bind_name)
+    if campo in CAMPOS_SENSIBLES:
+        return True
+    if campo in _CAMPOS_PUBLICOS:
+        return False
+    # Binds que no llevan el nombre de una columna (`lower_1` de func.lower(columna), `param_1`):
+    # el texto se oculta igualmente, un nombre de bind nuevo no debe filtrar datos personales
+    valores = valor if isinstance(valor, (list, tuple)) else (valor,)
+    return any(isinstance(v, (str, bytes)) for v in valores)
+
+
+def parametros_redactados(context) -> Any:
+    """Parámetros de la consulta por nombre de bind, con los datos personales ocultos"""
+    if context is None or context.compiled is None or not context.compiled_parameters:
+        # SQL textual sin nombres de bind: no se puede saber qué es sensible
+        return "<omitidos>"
+
+    filas = [
+        {nombre: "***" if _sensible(nombre, valor) else valor for nombre, valor in params.items()}
+        for params in context.compiled_parameters
+    ]
+    # En executemany solo se muestra la primera fila
+    return filas[0] if len(filas) == 1 else {"filas": len(filas), "primera": filas[0]}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info.pop("query_start", None)
+    if inicio is None:
+        return
+    duracion = time.perf_counter() - inicio
+
+    # Tiempo y número de consultas de la petición en curso (ver app.core.metricas)
+    registrar_consulta(duracion)
+    estadisticas = peticion_actual.get()
+
+    if estadisticas is not None and estadisticas.linea_tiempo is not None:
+        estadisticas.linea_tiempo.append({
+            "inicio_ms": round((inicio - estadisticas.inicio) * 1000, 3),
+            "duracion_ms": round(duracion * 1000, 3),
+            "sql": statement,
+            "parametros": parametros_redactados(context),
+        })
+
+    if settings.SLOW_QUERY_MS and duracion * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Consulta lenta (%.1f ms) en %s: %s | parámetros: %s",
+            duracion * 1000,
+            estadisticas.ruta if estadisticas is not None else "fuera de una petición",
+            statement,
+            parametros_redactados(context),
+        )
+
+
+def instrumentar_engine(async_engine) -> None:
+    """Registrar los hooks de métricas, consultas lentas y perfilado en un engine"""
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,15 +1,101 @@
+import itertools
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.db.consultas import instrumentar_engine
+from app.db.pool import InstrumentedPool, limites_pool
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+def _create_engine(url: str):
+    # Cada worker tiene su propio pool: el límite de conexiones se reparte entre todos
+    pool_size, max_overflow = limites_pool(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.WEB_WORKERS, settings.DB_MAX_CONNECTIONS
+    )
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    instrumentar_engine(async_engine)
+    return async_engine
+
+engine = _create_engine(settings.DATABASE_URL)
+
+# Réplicas de lectura opcionales, repartidas por turnos (round-robin)
+replica_engines = [_create_engine(url) for url in settings.replica_urls]
+_replica_cycle = itertools.cycle(replica_engines)
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+class RoutingSession(Session):
+    """Sesión que lee de una réplica hasta su primera escritura y luego usa el primario"""
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or self.info.get("primary") or not replica_engines:
+            return engine.sync_engine
+        
+        # La misma réplica durante toda la sesión, para lecturas coherentes
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = next(_replica_cycle).sync_engine
+        return replica
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_primary(session, flush_context):
+    # Lo leído después de escribir debe ver esa escritura
+    session.info["primary"] = True
+
+ReadSessionLocal = sessionmaker(
+    class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
+
+def usar_primario(session: AsyncSession) -> None:
+    """Enviar al primario las siguientes consultas de la sesión (sin efecto fuera de RoutingSession)"""
+    session.sync_session.info["primary"] = True
+
+def lee_de_replica(session: AsyncSession) -> bool:
+    """Si la siguiente lectura de la sesión irá a una réplica"""
+    sync_session = session.sync_session
+    return (
+        isinstance(sync_session, RoutingSession)
+        and bool(replica_engines)
+        and not sync_session.info.get("primary")
+    )
+
+async def dispose_engines():
+    """Cerrar las conexiones del primario y de las réplicas"""
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+
 async def get_db():
     async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_read_db(request: Request):
+    """Sesión para endpoints de solo lectura: réplicas si están configuradas"""
+    # Peticiones que pueden escribir se quedan en el primario
+    factory = ReadSessionLocal if request.method in ("GET", "HEAD") else AsyncSessionLocal
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_replica_db():
+    """Sesión de réplica para endpoints POST que solo consultan (búsquedas en lote)"""
+    async with ReadSessionLocal() as session:
         try:
             yield session
         finally:
@@ -0,0 +1,97 @@
+import logging
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Contadores acumulados de obtención de conexiones del pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Pool que mide la espera por conexión y deja visible el agotamiento"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            logger.error(
+                "Pool de conexiones agotado: %d en uso, overflow %d, timeout %.1fs",
+                self.checkedout(), self.overflow(), self._timeout
+            )
+            raise
+        finally:
+            wait = time.perf_counter() - inicio
+            self.stats.record(wait)
+            if wait * 1000 >= settings.DB_POOL_SLOW_CHECKOUT_MS:
+                self.stats.slow_checkouts += 1
+                logger.warning(
+                    "Espera de %.0f ms por una conexión (%d en uso, overflow %d)",
+                    wait * 1000, self.checkedout(), self.overflow()
+                )
+
+
+# SQLAlchemy registra los eventos del pool en "<módulo>.<clase>": como con sqlalchemy.pool, solo avisos
+logging.getLogger(f"{__name__}.{InstrumentedPool.__name__}").setLevel(logging.WARNING)
+
+
+def limites_pool(pool_size: int, max_overflow: int, workers: int, max_conexiones: int) -> tuple[int, int]:
+    """pool_size y max_overflow de cada worker para que entre todos no superen `max_conexiones`"""
+    if max_conexiones <= 0:
+        return pool_size, max_overflow
+    por_worker = max_conexiones // max(workers, 1)
+    if por_worker < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_conexiones} no alcanza para {workers} workers (mínimo una conexión por worker)"
+        )
+    tamano = min(pool_size, por_worker)
+    overflow = min(max_overflow, por_worker - tamano)
+    if (tamano, overflow) != (pool_size, max_overflow):
+        logger.info(
+            "Pool limitado a %d + %d conexiones por worker (%d workers, máximo %d)",
+            tamano, overflow, workers, max_conexiones
+        )
+    return tamano, overflow
+
+
+def pool_status(pool) -> dict:
+    """Estado actual y contadores de un pool"""
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update({
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "slow_checkouts": stats.slow_checkouts,
+            "wait_avg_ms": round(stats.wait_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+            "wait_max_ms": round(stats.wait_max * 1000, 3),
+        })
+    return status
@@ -1,14 +1,31 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import exc
 from app.core.config import settings
-from app.api import auth, clientes
+from app.core.logging_config import iniciar_logging, detener_logging
+from app.core.metricas import MetricasMiddleware, registry
+from app.core.perfilado import PerfilMiddleware
+from app.api import auth, clientes, diagnostico, estadisticas
+from app.db.database import dispose_engines
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Los logs se escriben desde un hilo aparte, no desde el event loop
+    iniciar_logging()
+    yield
+    # Cerrar las conexiones del pool al detener el proceso
+    await dispose_engines()
+    detener_logging()
 
 # Crear aplicación FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
     description="API para gestión de clientes bancarios - FinTechBank",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -20,9 +37,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Perfilado opcional por petición (interno a las métricas, que lo envuelven)
+app.add_middleware(PerfilMiddleware)
+
+# Métricas por ruta (ASGI puro, sin BaseHTTPMiddleware)
+app.add_middleware(MetricasMiddleware)
+
 # Incluir routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(clientes.router, prefix=settings.API_V1_STR)
+app.include_router(estadisticas.router, prefix=settings.API_V1_STR)
+app.include_router(diagnostico.router, prefix=settings.API_V1_STR)
+
+@app.exception_handler(exc.TimeoutError)
+async def pool_timeout_handler(request: Request, error: exc.TimeoutError):
+    """Pool de conexiones agotado: responder 503 en lugar de un error genérico"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servicio saturado, inténtelo de nuevo"},
+        headers={"Retry-After": "1"},
+    )
 
 @app.get("/")
 def read_root():
@@ -35,4 +69,9 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "service": "fintechbank-api"}
\ No newline at end of file
+    return {"status": "healthy", "service": "fintechbank-api"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métricas en formato de texto de Prometheus"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
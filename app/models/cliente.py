@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, Enum, Index, BigInteger
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 import enum
 
 Base = declarative_base()
@@ -21,6 +22,10 @@ class GeneroEnum(str, enum.Enum):
     FEMENINO = "femenino"
     OTRO = "otro"
 
+def ahora_utc() -> datetime:
+    """Marca de tiempo de created_at/updated_at"""
+    return datetime.now(timezone.utc)
+
 class Cliente(Base):
     __tablename__ = "clientes"
     
@@ -28,7 +33,8 @@ class Cliente(Base):
     nombre = Column(String(100), nullable=False)
     apellido = Column(String(100), nullable=False)
     numero_cuenta = Column(String(20), unique=True, index=True, nullable=False)
-    saldo = Column(Float, default=0.0)
+    # Importe exacto en la moneda de la cuenta (DECIMAL, sin errores de redondeo de float)
+    saldo = Column(Numeric(18, 2), default=0)
     fecha_nacimiento = Column(Date, nullable=False)
     direccion = Column(String(255))
     telefono = Column(String(20))
@@ -41,5 +47,32 @@ class Cliente(Base):
     nacionalidad = Column(String(50))
     
     # Audit fields
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    # Valores calculados al construir el INSERT/UPDATE: el objeto los tiene sin releer la fila
+    # (MySQL no tiene RETURNING). server_default queda para las filas escritas fuera de la app
+    created_at = Column(DateTime(timezone=True), default=ahora_utc, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=ahora_utc)
+    
+    __table_args__ = (
+        # Búsqueda por texto sobre nombre y apellido (parámetro `q`)
+        Index("ix_clientes_nombre_apellido_ft", "nombre", "apellido", mysql_prefix="FULLTEXT"),
+        # Listados filtrados por tipo con paginación por cursor (WHERE tipo_cliente = ? AND id > ? ORDER BY id)
+        Index("ix_clientes_tipo_cliente_id", "tipo_cliente", "id"),
+        # Filtro `nombre` por prefijo (LIKE 'texto%')
+        Index("ix_clientes_nombre", "nombre"),
+        # Consultas y exportaciones por fecha de alta
+        Index("ix_clientes_created_at", "created_at"),
+    )
+
+class ClienteResumen(Base):
+    """Conteo y saldo total de clientes por grupo, mantenido por el CRUD en cada escritura"""
+    __tablename__ = "clientes_resumen"
+    
+    # Dimensiones: valor del enum o texto; "" representa NULL (no admitido en la clave primaria)
+    tipo_cliente = Column(String(20), primary_key=True)
+    nacionalidad = Column(String(50), primary_key=True)
+    genero = Column(String(20), primary_key=True)
+    # Año de nacimiento: la edad se calcula al consultar, así el resumen no caduca
+    anio_nacimiento = Column(Integer, primary_key=True)
+    
+    clientes = Column(BigInteger, nullable=False, default=0)
+    saldo_total = Column(Numeric(24, 2), nullable=False, default=0)
\ No newline at end of file
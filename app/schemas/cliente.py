@@ -1,14 +1,19 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, PlainSerializer, validator
+from typing import Annotated, Optional, Union
 from datetime import date, datetime
+from decimal import Decimal
 from app.models.cliente import TipoClienteEnum, EstadoCivilEnum, GeneroEnum
+import enum
+
+# Decimal exacto en Python y en la BD; en JSON se serializa como número, igual que antes de DECIMAL
+SaldoDecimal = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
 
 # Base schema con campos comunes
 class ClienteBase(BaseModel):
     nombre: str = Field(..., min_length=2, max_length=100)
     apellido: str = Field(..., min_length=2, max_length=100)
     numero_cuenta: str = Field(..., min_length=10, max_length=20)
-    saldo: float = Field(default=0.0, ge=0)
+    saldo: SaldoDecimal = Field(default=Decimal("0"), ge=0, max_digits=18, decimal_places=2)
     fecha_nacimiento: date
     direccion: Optional[str] = Field(None, max_length=255)
     telefono: Optional[str] = Field(None, max_length=20)
@@ -39,7 +44,7 @@ class ClienteUpdate(BaseModel):
     nombre: Optional[str] = Field(None, min_length=2, max_length=100)
     apellido: Optional[str] = Field(None, min_length=2, max_length=100)
     numero_cuenta: Optional[str] = Field(None, min_length=10, max_length=20)
-    saldo: Optional[float] = Field(None, ge=0)
+    saldo: Optional[SaldoDecimal] = Field(None, ge=0, max_digits=18, decimal_places=2)
     fecha_nacimiento: Optional[date] = None
     direccion: Optional[str] = Field(None, max_length=255)
     telefono: Optional[str] = Field(None, max_length=20)
@@ -72,10 +77,51 @@ class Cliente(ClienteBase):
     class Config:
         from_attributes = True
 
+# Modo de cálculo del total en los listados
+class ModoConteoEnum(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
 # Schema para listado con paginación
 class ClienteList(BaseModel):
     clientes: list[Cliente]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: Optional[int] = None
+
+# Schema para listado con paginación por cursor (keyset)
+class ClienteCursorList(BaseModel):
+    clientes: list[Cliente]
+    size: int
+    next_cursor: Optional[str] = None
+
+# Formatos de importación/exportación masiva
+class FormatoEnum(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+# Máximo de claves por petición de búsqueda en lote
+MAX_LOTE_BUSQUEDA = 1000
+
+# Peticiones de búsqueda en lote
+class LoteIds(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_LOTE_BUSQUEDA)
+
+class LoteEmails(BaseModel):
+    emails: list[str] = Field(..., min_length=1, max_length=MAX_LOTE_BUSQUEDA)
+
+class LoteCuentas(BaseModel):
+    cuentas: list[str] = Field(..., min_length=1, max_length=MAX_LOTE_BUSQUEDA)
+
+# Resultado de una clave buscada; `cliente` es null si no existe
+class ResultadoBusquedaLote(BaseModel):
+    clave: Union[int, str]
+    encontrado: bool
+    cliente: Optional[Cliente] = None
+
+# Resultados en el mismo orden que las claves recibidas
+class ClienteLote(BaseModel):
+    resultados: list[ResultadoBusquedaLote]
+    no_encontrados: int
\ No newline at end of file
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional
+from app.schemas.cliente import SaldoDecimal
+
+# Un grupo del resumen de saldos; solo vienen las dimensiones pedidas
+class GrupoSaldo(BaseModel):
+    tipo_cliente: Optional[str] = None
+    nacionalidad: Optional[str] = None
+    genero: Optional[str] = None
+    rango_edad: Optional[str] = None
+    clientes: int
+    saldo_total: SaldoDecimal
+    saldo_promedio: SaldoDecimal
+
+# Resumen de saldos agrupado
+class ResumenSaldos(BaseModel):
+    agrupar_por: list[str]
+    grupos: list[GrupoSaldo]
+
+# Resultado de reconstruir el resumen
+class ResultadoReconstruccion(BaseModel):
+    grupos: int
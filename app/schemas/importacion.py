@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+# Máximo de errores por fila que se devuelven en una importación masiva
+MAX_IMPORT_ERRORS = 1000
+
+# Error de una fila en la importación masiva
+class ErrorImportacion(BaseModel):
+    fila: int
+    error: str
+
+# Resultado de una importación masiva (clientes o usuarios)
+class ResultadoImportacion(BaseModel):
+    total: int = 0
+    insertados: int = 0
+    errores: list[ErrorImportacion] = []
+    errores_omitidos: int = 0
+
+    def agregar_error(self, fila: int, error: str) -> None:
+        """Registrar el error de una fila sin superar MAX_IMPORT_ERRORS"""
+        if len(self.errores) < MAX_IMPORT_ERRORS:
+            self.errores.append(ErrorImportacion(fila=fila, error=error))
+        else:
+            self.errores_omitidos += 1
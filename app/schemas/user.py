@@ -1,13 +1,34 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional
+import re
+
+def comprobar_password(password: str) -> str:
+    """Requisitos de seguridad de la contraseña (CLI crear-admin y carga masiva)"""
+    if len(password) < 8:
+        raise ValueError("La contraseña debe tener al menos 8 caracteres.")
+    if not re.search(r"[A-Z]", password):
+        raise ValueError("La contraseña debe contener al menos una letra mayúscula.")
+    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        raise ValueError("La contraseña debe contener al menos un carácter especial.")
+    return password
 
 class UserBase(BaseModel):
-    username: str
-    email: EmailStr
+    # Longitudes de las columnas String(50)/String(100) de users
+    username: str = Field(..., min_length=1, max_length=50)
+    email: EmailStr = Field(..., max_length=100)
 
 class UserCreate(UserBase):
     password: str
 
+# Fila de la carga masiva de usuarios (CLI crear-usuarios)
+class UserBulkCreate(UserCreate):
+    is_active: bool = True
+    is_admin: bool = False
+
+    @validator('password')
+    def validate_password(cls, v):
+        return comprobar_password(v)
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -20,6 +41,17 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class UserFlagsUpdate(BaseModel):
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+
+    # Los campos se pueden omitir, pero no enviar a null: las columnas no admiten NULL
+    @validator('is_active', 'is_admin')
+    def validate_no_nulo(cls, v):
+        if v is None:
+            raise ValueError('No puede ser null')
+        return v
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -0,0 +1,73 @@
+"""
+Punto de entrada de producción: uvicorn con varios workers, uvloop y httptools.
+
+Uso:
+    python -m app.server
+
+Workers, puerto, keep-alive y backlog se configuran con las variables WEB_*
+de `Settings`. Cada worker es un proceso con su propio pool de conexiones,
+limitado por DB_MAX_CONNECTIONS / WEB_WORKERS. Con más de un worker hace falta
+CACHE_URL: las invalidaciones de una caché en memoria solo llegan a un proceso.
+Las métricas de los workers se suman en /metrics con el modo multiproceso de
+prometheus_client (PROMETHEUS_MULTIPROC_DIR).
+"""
+import importlib.util
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import uvicorn
+
+from app.core.config import settings
+from app.db.pool import limites_pool
+
+
+def _disponible(modulo: str) -> bool:
+    return importlib.util.find_spec(modulo) is not None
+
+
+def _directorio_metricas() -> Optional[str]:
+    """Preparar el directorio en el que cada worker escribe sus métricas; devuelve el temporal creado"""
+    directorio = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directorio:
+        # Los ficheros de una ejecución anterior sumarían valores de procesos que ya no existen
+        shutil.rmtree(directorio, ignore_errors=True)
+        os.makedirs(directorio)
+        return None
+    # Los workers heredan el entorno: prometheus_client lo lee al importarse en cada uno
+    directorio = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metricas-")
+    return directorio
+
+
+def main() -> None:
+    # Un presupuesto de conexiones imposible falla aquí, antes de lanzar los workers
+    limites_pool(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.WEB_WORKERS, settings.DB_MAX_CONNECTIONS)
+    # Un usuario desactivado o un cliente modificado seguirían en la caché de los demás workers
+    if settings.WEB_WORKERS > 1 and not settings.CACHE_URL:
+        raise SystemExit(
+            f"WEB_WORKERS={settings.WEB_WORKERS} requiere una caché compartida (CACHE_URL=redis://...)"
+        )
+    directorio_metricas = _directorio_metricas() if settings.WEB_WORKERS > 1 else None
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.WEB_HOST,
+            port=settings.WEB_PORT,
+            workers=settings.WEB_WORKERS,
+            # uvloop no existe en Windows: ahí se usa el event loop estándar
+            loop="uvloop" if _disponible("uvloop") else "asyncio",
+            http="httptools" if _disponible("httptools") else "h11",
+            timeout_keep_alive=settings.WEB_KEEPALIVE_SECONDS,
+            backlog=settings.WEB_BACKLOG,
+            proxy_headers=True,
+            forwarded_allow_ips=settings.WEB_FORWARDED_ALLOW_IPS,
+        )
+    finally:
+        if directorio_metricas is not None:
+            shutil.rmtree(directorio_metricas, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
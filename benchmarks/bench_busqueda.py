@@ -0,0 +1,92 @@
+"""
+Compara los filtros `nombre` (ILIKE '%texto%') y `nombre_prefijo` (LIKE 'texto%'
+sobre ix_clientes_nombre) frente a la búsqueda FULLTEXT (`q`) de ClienteCRUD
+contra la base de datos de DATABASE_URL.
+
+Uso:
+    python benchmarks/bench_busqueda.py --seed 200000 --repeticiones 50
+
+`--seed` inserta clientes sintéticos (cuentas con prefijo BENCH) antes de
+medir; usar solo contra una base de datos de desarrollo.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).resolve().parents[1].as_posix())
+
+from sqlalchemy import insert, func, select
+
+from app.crud.cliente import cliente_crud
+from app.db.database import AsyncSessionLocal, engine
+from app.models.cliente import Cliente
+from app.schemas.cliente import ModoConteoEnum
+
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Jorge", "Sofía", "Andrés", "Camila"]
+APELLIDOS = ["Pérez", "Gómez", "Rodríguez", "Martínez", "López", "García", "Hernández", "Torres"]
+BUSQUEDAS = ["Juan", "Gómez", "Laura Torres", "Andrés", "Martín"]
+
+
+async def seed(total: int, lote: int = 5000) -> None:
+    """Insertar clientes sintéticos en lotes"""
+    async with AsyncSessionLocal() as session:
+        inicio = await session.scalar(select(func.count(Cliente.id))) or 0
+        for base in range(inicio, inicio + total, lote):
+            filas = []
+            for i in range(base, min(base + lote, inicio + total)):
+                filas.append({
+                    "nombre": f"{random.choice(NOMBRES)}{i % 97}",
+                    "apellido": random.choice(APELLIDOS),
+                    "numero_cuenta": f"BENCH{i:012d}",
+                    "saldo": 0,
+                    "fecha_nacimiento": date(1980, 1, 1),
+                    "correo_electronico": f"bench{i}@example.com",
+                    "numero_identificacion": f"B{i:012d}",
+                })
+            await session.execute(insert(Cliente), filas)
+            await session.commit()
+
+
+async def medir(repeticiones: int, **filtros) -> list[float]:
+    """Ejecutar get_all con los filtros dados y devolver los tiempos en ms"""
+    tiempos = []
+    async with AsyncSessionLocal() as session:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            await cliente_crud.get_all(session, limit=20, conteo=ModoConteoEnum.NONE, **filtros)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def resumen(tiempos: list[float]) -> str:
+    ordenados = sorted(tiempos)
+    p95 = ordenados[int(len(ordenados) * 0.95) - 1]
+    return f"media={statistics.mean(tiempos):8.2f}ms  p50={statistics.median(tiempos):8.2f}ms  p95={p95:8.2f}ms"
+
+
+async def main(args) -> None:
+    engine.echo = False
+    if args.seed:
+        await seed(args.seed)
+
+    for texto in BUSQUEDAS:
+        contiene = await medir(args.repeticiones, nombre=texto.split()[0])
+        prefijo = await medir(args.repeticiones, nombre_prefijo=texto.split()[0])
+        fulltext = await medir(args.repeticiones, q=texto)
+        print(f"{texto!r:16} CONTIENE {resumen(contiene)}")
+        print(f"{'':16} PREFIJO  {resumen(prefijo)}")
+        print(f"{'':16} FULLTEXT {resumen(fulltext)}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Clientes sintéticos a insertar antes de medir")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
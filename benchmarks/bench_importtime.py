@@ -0,0 +1,93 @@
+"""
+Mide el coste de import de la CLI y de la aplicación con `python -X importtime`
+y el tiempo total de `python app/cli.py --help`.
+
+Uso:
+    python benchmarks/bench_importtime.py --repeticiones 5 --top 15
+
+Cada medición se lanza en un proceso nuevo (sin módulos ya cargados) y se
+toma la mejor de las repeticiones. No necesita base de datos: se usa una URL
+SQLite temporal solo para que `Settings` se pueda construir en `app.main`.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+OBJETIVOS = {
+    "app.cli": "import app.cli",
+    "app.main": "import app.main",
+}
+
+
+def entorno(sin_configuracion: bool = False) -> dict:
+    env = dict(os.environ, PYTHONPATH=RAIZ.as_posix(), PYTHONDONTWRITEBYTECODE="1")
+    if sin_configuracion:
+        # La CLI no debe necesitar la configuración para mostrar la ayuda
+        env.pop("DATABASE_URL", None)
+        env.pop("SECRET_KEY", None)
+    else:
+        env.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/importtime.db")
+        env.setdefault("SECRET_KEY", "bench-secret-key")
+    return env
+
+
+def importtime(codigo: str) -> list[tuple[int, int, str]]:
+    """(self_us, acumulado_us, módulo) de cada import, en el orden en que se completan"""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, env=entorno(), capture_output=True, text=True, check=True
+    ).stderr
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        filas.append((int(propio), int(acumulado), modulo.rstrip()))
+    return filas
+
+
+def total_ms(filas: list[tuple[int, int, str]]) -> float:
+    # Los módulos de primer nivel (sin sangría) suman el tiempo total de import
+    return sum(acumulado for _, acumulado, modulo in filas if not modulo.startswith("  ")) / 1000
+
+
+def medir_help(repeticiones: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "app/cli.py", "--help"],
+            cwd=RAIZ, env=entorno(sin_configuracion=True), capture_output=True, check=True
+        )
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def main(args) -> None:
+    for nombre, codigo in OBJETIVOS.items():
+        ejecuciones = [importtime(codigo) for _ in range(args.repeticiones)]
+        filas = min(ejecuciones, key=total_ms)
+        print(f"{nombre:10} import total={total_ms(filas):8.1f}ms  módulos={len(filas)}")
+
+        # Tiempo propio sumado por paquete raíz: reparte el total sin contar nada dos veces
+        paquetes: dict[str, int] = {}
+        for propio, _, modulo in filas:
+            raiz = modulo.strip().split(".")[0]
+            paquetes[raiz] = paquetes.get(raiz, 0) + propio
+        for raiz, propio in sorted(paquetes.items(), key=lambda p: -p[1])[:args.top]:
+            print(f"    {raiz:28} {propio / 1000:8.1f}ms")
+
+    print(f"app/cli.py --help (proceso completo, sin DATABASE_URL) {medir_help(args.repeticiones):8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Paquetes más costosos que se muestran")
+    main(parser.parse_args())
@@ -0,0 +1,68 @@
+"""
+Mide la latencia de GET /clientes/{id} mientras se ejecuta una tormenta de
+logins (bcrypt) contra la aplicación en proceso, con una base SQLite temporal.
+
+Uso:
+    python benchmarks/bench_login_storm.py --hash-workers 4
+    python benchmarks/bench_login_storm.py --hash-workers 0   # bcrypt en el event loop
+
+Requiere `httpx` y `aiosqlite` (solo para benchmarks).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from harness import CREDENCIALES, cerrar, cliente_http, configurar_entorno, crear_esquema, percentil
+
+
+async def main(args) -> None:
+    await crear_esquema()
+
+    async with cliente_http() as client:
+        cliente = await client.post("/api/v1/clientes/", json={
+            "nombre": "Bench", "apellido": "Cliente", "numero_cuenta": "0000000001",
+            "fecha_nacimiento": "1990-01-01", "correo_electronico": "cliente@example.com",
+            "numero_identificacion": "BENCH001",
+        })
+        ruta = f"/api/v1/clientes/{cliente.json()['id']}"
+
+        fin = time.perf_counter() + args.duracion
+        logins = 0
+        latencias: list[float] = []
+
+        async def tormenta():
+            nonlocal logins
+            while time.perf_counter() < fin:
+                await client.post("/api/v1/auth/login", data=CREDENCIALES)
+                logins += 1
+
+        async def sonda():
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                await client.get(ruta)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*(tormenta() for _ in range(args.concurrencia)), sonda())
+
+    await cerrar()
+
+    print(f"hash workers: {args.hash_workers}  logins concurrentes: {args.concurrencia}")
+    print(f"logins/s: {logins / args.duracion:.1f}")
+    print(
+        f"GET {ruta}: n={len(latencias)}  p50={statistics.median(latencias):.2f}ms  "
+        f"p95={percentil(latencias, 0.95):.2f}ms  p99={percentil(latencias, 0.99):.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hash-workers", type=int, default=4)
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos de tormenta")
+    args = parser.parse_args()
+
+    # La configuración se fija antes de importar la aplicación
+    configurar_entorno(PASSWORD_HASH_WORKERS=args.hash_workers)
+    asyncio.run(main(args))
@@ -0,0 +1,100 @@
+"""
+Compara la serialización de una página de ClienteList por la ruta estándar
+de FastAPI (validación de response_model + jsonable_encoder + json.dumps)
+frente a la ruta rápida de FAST_JSON_RESPONSES (filas ORM convertidas al
+schema sin revalidarlas y serializadas con model_dump_json).
+
+Uso:
+    python benchmarks/bench_serializacion.py --filas 100 --repeticiones 500
+
+No necesita base de datos: las filas son entidades ORM en memoria.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).resolve().parents[1].as_posix())
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.respuestas import PydanticJSONResponse, desde_orm
+from app.models.cliente import Cliente, TipoClienteEnum
+from app.schemas.cliente import Cliente as ClienteSchema, ClienteList
+
+
+def filas(total: int) -> list[Cliente]:
+    """Entidades ORM transitorias, como las que devuelve ClienteCRUD.get_all"""
+    return [
+        Cliente(
+            id=i,
+            nombre=f"Nombre{i}",
+            apellido="Apellido",
+            numero_cuenta=f"{i:010d}",
+            saldo=Decimal("1234.56"),
+            fecha_nacimiento=date(1985, 5, 17),
+            direccion="Calle 1 # 2-3",
+            telefono="3001234567",
+            correo_electronico=f"cliente{i}@example.com",
+            tipo_cliente=TipoClienteEnum.INDIVIDUAL,
+            numero_identificacion=f"ID{i:08d}",
+            profesion="Ingeniería",
+            nacionalidad="Colombiana",
+            created_at=datetime(2024, 1, 1, 12, 0),
+        )
+        for i in range(1, total + 1)
+    ]
+
+
+async def ruta_estandar(clientes: list[Cliente], campo) -> bytes:
+    lista = ClienteList(clientes=clientes, total=len(clientes), page=1, size=len(clientes), pages=1)
+    contenido = await serialize_response(field=campo, response_content=lista)
+    return JSONResponse(contenido).body
+
+
+async def ruta_rapida(clientes: list[Cliente], campo) -> bytes:
+    filas_schema = [desde_orm(ClienteSchema, cliente) for cliente in clientes]
+    lista = ClienteList(clientes=filas_schema, total=len(clientes), page=1, size=len(clientes), pages=1)
+    return PydanticJSONResponse(lista).body
+
+
+async def medir(funcion, clientes: list[Cliente], campo, repeticiones: int) -> list[float]:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        await funcion(clientes, campo)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def resumen(tiempos: list[float]) -> str:
+    ordenados = sorted(tiempos)
+    p95 = ordenados[int(len(ordenados) * 0.95) - 1]
+    return f"media={statistics.mean(tiempos):7.3f}ms  p50={statistics.median(tiempos):7.3f}ms  p95={p95:7.3f}ms"
+
+
+async def main(args) -> None:
+    clientes = filas(args.filas)
+    campo = create_response_field(name="Response_listar_clientes", type_=ClienteList)
+
+    estandar, rapida = await ruta_estandar(clientes, campo), await ruta_rapida(clientes, campo)
+    print(f"bytes: estándar={len(estandar)}  rápida={len(rapida)}")
+
+    for nombre, funcion in (("estándar", ruta_estandar), ("rápida", ruta_rapida)):
+        print(f"{nombre:9} {resumen(await medir(funcion, clientes, campo, args.repeticiones))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=100, help="Clientes por página")
+    parser.add_argument("--repeticiones", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,58 @@
+"""
+Compara dos resultados de benchmarks/suite.py y marca las regresiones.
+
+Uso:
+    python benchmarks/comparar.py antes.json despues.json --umbral 10
+
+Una carga empeora si su p95 sube o su throughput baja más de `--umbral` %.
+Sale con código 1 si hay alguna regresión, para usarlo en CI.
+"""
+import argparse
+import json
+import sys
+
+METRICAS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def variacion(antes: float, despues: float) -> float:
+    return (despues - antes) / antes * 100 if antes else 0.0
+
+
+def main(args) -> int:
+    with open(args.antes) as f:
+        antes = json.load(f)
+    with open(args.despues) as f:
+        despues = json.load(f)
+
+    if antes.get("parametros") != despues.get("parametros"):
+        print(f"Aviso: parámetros distintos {antes.get('parametros')} vs {despues.get('parametros')}")
+
+    print(f"{antes['commit']} -> {despues['commit']}")
+    regresiones = []
+    for carga, actual in despues["cargas"].items():
+        previo = antes["cargas"].get(carga)
+        if previo is None:
+            print(f"{carga:18} (nueva)")
+            continue
+
+        columnas = []
+        for metrica in METRICAS:
+            cambio = variacion(previo.get(metrica, 0), actual.get(metrica, 0))
+            columnas.append(f"{metrica}={actual.get(metrica, 0):9.2f} ({cambio:+6.1f}%)")
+
+        empeora_p95 = variacion(previo.get("p95_ms", 0), actual.get("p95_ms", 0)) > args.umbral
+        empeora_rps = variacion(previo.get("rps", 0), actual.get("rps", 0)) < -args.umbral
+        marca = "  REGRESIÓN" if empeora_p95 or empeora_rps else ""
+        if marca:
+            regresiones.append(carga)
+        print(f"{carga:18} " + "  ".join(columnas) + marca)
+
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("antes")
+    parser.add_argument("despues")
+    parser.add_argument("--umbral", type=float, default=10.0, help="Porcentaje tolerado antes de marcar regresión")
+    sys.exit(main(parser.parse_args()))
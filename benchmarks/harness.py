@@ -0,0 +1,131 @@
+"""
+Utilidades compartidas por los benchmarks que ejecutan la aplicación en
+proceso (httpx.ASGITransport) sobre una base SQLite temporal.
+
+La configuración se lee al importar `app`, así que `configurar_entorno()`
+debe llamarse antes de cualquier import de la aplicación.
+"""
+import os
+import statistics
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, RAIZ.as_posix())
+
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Jorge", "Sofía", "Andrés", "Camila"]
+APELLIDOS = ["Pérez", "Gómez", "Rodríguez", "Martínez", "López", "García", "Hernández", "Torres"]
+CREDENCIALES = {"username": "bench", "password": "Bench!2345"}
+
+
+def configurar_entorno(**variables: str) -> str:
+    """Base SQLite temporal y variables de entorno de la aplicación; devuelve la ruta del fichero"""
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Bajo carga SQLite serializa las escrituras; no interesa el log de consultas lentas
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+    for nombre, valor in variables.items():
+        os.environ[nombre] = str(valor)
+    return db_path
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def resumen_latencias(latencias_ms: list[float], duracion: float, errores: int = 0) -> dict:
+    """Throughput y percentiles de una carga"""
+    if not latencias_ms:
+        return {"peticiones": 0, "errores": errores, "rps": 0.0}
+    return {
+        "peticiones": len(latencias_ms),
+        "errores": errores,
+        "rps": round(len(latencias_ms) / duracion, 2),
+        "p50_ms": round(statistics.median(latencias_ms), 3),
+        "p95_ms": round(percentil(latencias_ms, 0.95), 3),
+        "p99_ms": round(percentil(latencias_ms, 0.99), 3),
+        "max_ms": round(max(latencias_ms), 3),
+    }
+
+
+def fila_cliente(i: int) -> dict:
+    """Cliente sintético determinista para la semilla"""
+    return {
+        "nombre": f"{NOMBRES[i % len(NOMBRES)]}{i % 97}",
+        "apellido": APELLIDOS[i % len(APELLIDOS)],
+        "numero_cuenta": f"BENCH{i:012d}",
+        "saldo": Decimal(i % 1000000) / 100,
+        "fecha_nacimiento": date(1960 + i % 40, 1 + i % 12, 1 + i % 28),
+        "correo_electronico": f"bench{i}@example.com",
+        "numero_identificacion": f"B{i:012d}",
+    }
+
+
+async def crear_esquema() -> None:
+    from app.db.database import engine
+    from app.models.cliente import Base
+    from app.models import user  # noqa: F401  (registra la tabla users)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def sembrar_clientes(total: int, lote: int = 5000) -> None:
+    """Insertar `total` clientes sintéticos en lotes"""
+    from sqlalchemy import insert
+
+    from app.db.database import AsyncSessionLocal
+    from app.models.cliente import Cliente, TipoClienteEnum
+
+    tipos = list(TipoClienteEnum)
+    async with AsyncSessionLocal() as session:
+        for base in range(0, total, lote):
+            filas = [
+                {**fila_cliente(i), "tipo_cliente": tipos[i % len(tipos)]}
+                for i in range(base, min(base + lote, total))
+            ]
+            await session.execute(insert(Cliente), filas)
+            await session.commit()
+
+
+async def hacer_admin(username: str) -> None:
+    from sqlalchemy import update
+
+    from app.crud.user import user_cache
+    from app.db.database import AsyncSessionLocal
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(User).where(User.username == username).values(is_admin=True))
+        await session.commit()
+    await user_cache.delete(username)
+
+
+@asynccontextmanager
+async def cliente_http(admin: bool = False):
+    """Cliente httpx contra la aplicación en proceso, con un usuario registrado y su token"""
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/auth/register", json={**CREDENCIALES, "email": "bench@example.com"})
+        if admin:
+            await hacer_admin(CREDENCIALES["username"])
+        token = (await client.post("/api/v1/auth/login", data=CREDENCIALES)).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+
+async def cerrar() -> None:
+    from app.db.database import dispose_engines
+
+    await dispose_engines()
@@ -0,0 +1,176 @@
+"""
+Suite de carga de la API: ejecuta la aplicación en proceso sobre una base
+SQLite temporal sembrada con N clientes, lanza cada carga con concurrencia
+fija durante un tiempo y guarda throughput y p50/p95/p99 en JSON.
+
+Uso:
+    python benchmarks/suite.py --clientes 20000 --concurrencia 16 --duracion 10
+    python benchmarks/suite.py --cargas consultas,busqueda_nombre
+    python benchmarks/comparar.py benchmarks/resultados/<antes>.json benchmarks/resultados/<despues>.json
+
+Cargas:
+    login              POST /auth/login (bcrypt)
+    paginas_profundas  GET /clientes/?page=N en el último 20 % de las páginas
+    busqueda_nombre    GET /clientes/?nombre=<texto>
+    crear_actualizar   POST /clientes/ y PUT /clientes/{id} alternados
+    consultas          GET /clientes/{id} y /clientes/buscar/cuenta/{cuenta}
+
+Requiere `httpx` y `aiosqlite` (pip install -r benchmarks/requirements.txt).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+
+from harness import (
+    CREDENCIALES, NOMBRES, RAIZ, cerrar, cliente_http, configurar_entorno, crear_esquema,
+    resumen_latencias, sembrar_clientes,
+)
+
+TAMANO_PAGINA = 50
+
+
+class Contexto:
+    """Estado compartido por las cargas: tamaño de la semilla y contadores"""
+
+    def __init__(self, clientes: int, semilla: int):
+        self.clientes = clientes
+        self.rng = random.Random(semilla)
+        self.nuevos = count(clientes)
+        self.operaciones = count()
+
+    def id_aleatorio(self) -> int:
+        return self.rng.randint(1, self.clientes)
+
+
+async def login(client, ctx: Contexto):
+    return await client.post("/api/v1/auth/login", data=CREDENCIALES)
+
+
+async def paginas_profundas(client, ctx: Contexto):
+    paginas = max(1, ctx.clientes // TAMANO_PAGINA)
+    pagina = ctx.rng.randint(max(1, int(paginas * 0.8)), paginas)
+    return await client.get("/api/v1/clientes/", params={"page": pagina, "size": TAMANO_PAGINA})
+
+
+async def busqueda_nombre(client, ctx: Contexto):
+    nombre = f"{ctx.rng.choice(NOMBRES)}{ctx.rng.randint(1, 9)}"
+    return await client.get("/api/v1/clientes/", params={"nombre": nombre, "size": 20})
+
+
+async def crear_actualizar(client, ctx: Contexto):
+    if next(ctx.operaciones) % 2 == 0:
+        i = next(ctx.nuevos)
+        return await client.post("/api/v1/clientes/", json={
+            "nombre": "Carga", "apellido": "Suite", "numero_cuenta": f"SUITE{i:012d}",
+            "fecha_nacimiento": "1990-01-01", "correo_electronico": f"suite{i}@example.com",
+            "numero_identificacion": f"S{i:012d}",
+        })
+    return await client.put(f"/api/v1/clientes/{ctx.id_aleatorio()}", json={"saldo": ctx.rng.randint(0, 10000)})
+
+
+async def consultas(client, ctx: Contexto):
+    cliente_id = ctx.id_aleatorio()
+    if cliente_id % 2 == 0:
+        return await client.get(f"/api/v1/clientes/{cliente_id}")
+    return await client.get(f"/api/v1/clientes/buscar/cuenta/BENCH{cliente_id - 1:012d}")
+
+
+CARGAS = {
+    "login": login,
+    "paginas_profundas": paginas_profundas,
+    "busqueda_nombre": busqueda_nombre,
+    "crear_actualizar": crear_actualizar,
+    "consultas": consultas,
+}
+
+
+async def ejecutar_carga(client, carga, ctx: Contexto, concurrencia: int, duracion: float) -> dict:
+    """Lanzar `concurrencia` tareas que repiten la carga durante `duracion` segundos"""
+    latencias: list[float] = []
+    errores = 0
+    fin = time.perf_counter() + duracion
+
+    async def trabajador():
+        nonlocal errores
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            respuesta = await carga(client, ctx)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if respuesta.status_code >= 400:
+                errores += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    return resumen_latencias(latencias, time.perf_counter() - inicio, errores)
+
+
+def commit_actual() -> str:
+    def git(*args) -> str:
+        return subprocess.run(["git", *args], cwd=RAIZ, capture_output=True, text=True).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "desconocido"
+    # Cambios sin commit (fuera de los resultados) invalidan la comparación por commit
+    if git("status", "--porcelain", "--untracked-files=no", "--", ".", ":!benchmarks/resultados"):
+        commit += "-dirty"
+    return commit
+
+
+async def main(args) -> None:
+    await crear_esquema()
+    await sembrar_clientes(args.clientes)
+
+    ctx = Contexto(args.clientes, args.semilla)
+    resultados = {}
+    async with cliente_http(admin=True) as client:
+        for nombre in args.cargas:
+            resultados[nombre] = await ejecutar_carga(client, CARGAS[nombre], ctx, args.concurrencia, args.duracion)
+            r = resultados[nombre]
+            print(
+                f"{nombre:18} rps={r['rps']:8.1f}  p50={r.get('p50_ms', 0):8.2f}ms  "
+                f"p95={r.get('p95_ms', 0):8.2f}ms  p99={r.get('p99_ms', 0):8.2f}ms  errores={r['errores']}"
+            )
+    await cerrar()
+
+    commit = commit_actual()
+    informe = {
+        "commit": commit,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parametros": {
+            "clientes": args.clientes,
+            "concurrencia": args.concurrencia,
+            "duracion": args.duracion,
+            "semilla": args.semilla,
+        },
+        "cargas": resultados,
+    }
+    salida = Path(args.salida) if args.salida else RAIZ / "benchmarks" / "resultados" / f"{commit}.json"
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False))
+    print(f"Resultados guardados en {salida}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10000, help="Clientes sintéticos de la semilla")
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos por carga")
+    parser.add_argument("--cargas", type=lambda v: v.split(","), default=list(CARGAS), help="Cargas separadas por comas")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--hash-workers", type=int, default=4)
+    parser.add_argument("--salida", help="Fichero JSON (por defecto benchmarks/resultados/<commit>.json)")
+    args = parser.parse_args()
+
+    desconocidas = set(args.cargas) - set(CARGAS)
+    if desconocidas:
+        parser.error(f"Cargas desconocidas: {', '.join(sorted(desconocidas))}")
+
+    configurar_entorno(PASSWORD_HASH_WORKERS=args.hash_workers)
+    asyncio.run(main(args))